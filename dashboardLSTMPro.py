@@ -1,20 +1,32 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
-from tensorflow.keras.models import load_model
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
 from datetime import datetime, timedelta
 import hashlib
+import io
+import hmac
+import html
+import csv
+import re
+import glob
 import warnings
 import os
 import time
-import pytz # Import pytz for timezone handling
+from zoneinfo import ZoneInfo # Timezone database standar library (C-backed), pengganti pytz
 
-warnings.filterwarnings('ignore')
+# Filter warning yang ditargetkan (bukan 'ignore' global) untuk noise yang diketahui dari library.
+# Future/DeprecationWarning hanya dibungkam untuk TensorFlow/Keras: deprecation pandas dan Streamlit
+# (yang menyangkut kode aplikasi ini sendiri) tetap terlihat
+NOISY_WARNING_MODULES = r'(tensorflow|keras)(\.|$)'
+warnings.filterwarnings('ignore', category=FutureWarning, module=NOISY_WARNING_MODULES)
+warnings.filterwarnings('ignore', category=DeprecationWarning, module=NOISY_WARNING_MODULES)
+warnings.filterwarnings('ignore', category=UserWarning, message='Could not infer format')
+# Log C++ TensorFlow (INFO/WARNING) dibungkam sebelum TF di-import secara lazy
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
 
 # =============================================================================
 # ⚙️ KONFIGURASI APLIKASI GLOBAL (HARUS DI BAGIAN ATAS DAN HANYA SEKALI)
@@ -37,27 +49,130 @@ CSV_FILE_NAME = "data2parfull.csv"  # <-- GANTI DENGAN NAMA FILE CSV ANDA
 # Path lengkap ke file CSV (otomatis mengambil dari folder yang sama)
 CSV_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), CSV_FILE_NAME)
 
+# File model LSTM (di folder yang sama dengan script ini, tidak bergantung pada working directory)
+MODEL_FILE_NAME = "best_lstm_model.h5"
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), MODEL_FILE_NAME)
+
+# Ukuran batch maksimum per panggilan inferensi LSTM; batch dibulatkan ke pangkat dua
+# agar XLA hanya mengompilasi sedikit variasi shape
+PREDICT_BATCH_SIZE = 1024
+
+# Panjang forecast autoregresif: 1 bulan data hourly (30 hari * 24 jam)
+FORECAST_STEPS = 30 * 24
+
+# Default slider sequence length; juga panjang window dummy untuk warm-up graph saat model dimuat
+DEFAULT_SEQUENCE_LENGTH = 80
+
+# Jumlah titik maksimum per trace grafik utama; trace yang lebih panjang di-downsample dengan LTTB
+CHART_MAX_POINTS = 2000
+
+# Batas entri cache per versi file CSV: versi terbaru + satu sebelumnya (sesi yang belum rerun).
+# Prediksi juga dikunci per sequence_length, jadi diberi ruang untuk beberapa nilai slider.
+CSV_CACHE_MAX_ENTRIES = 2
+PREDICTION_CACHE_MAX_ENTRIES = 8
+
+# Jumlah bin histogram error test set (dihitung di server, yang dikirim ke browser hanya count per bin)
+ERROR_HISTOGRAM_BINS = 20
+
+# Delimiter yang didukung dan ukuran sampel untuk deteksi delimiter
+CSV_DELIMITERS = ',;\t'
+CSV_SNIFF_BYTES = 8192
+
+# Ukuran blok baca streaming PyArrow (64 MB): memori parse tetap terbatas walau file CSV membesar
+CSV_BLOCK_SIZE = 64 << 20
+
+# Kolom teks dengan rasio nilai unik di bawah batas ini disimpan sebagai category
+CATEGORY_MAX_RATIO = 0.5
+
+# Versi format sidecar Feather (ikut di nama file). Naikkan setiap kali isi yang disimpan berubah
+# (proyeksi kolom keyword, aturan downcast dtype), agar sidecar lama dari deploy sebelumnya tidak dipakai
+SIDECAR_FORMAT_VERSION = 1
+
+# Kata kunci untuk mengenali kolom timestamp dan tekanan dari nama kolom CSV
+TIMESTAMP_KEYWORDS = ['time', 'date', 'timestamp', 'waktu', 'tanggal']
+PRESSURE_KEYWORDS = ['tekanan', 'pressure', 'kondensor', 'condenser']
+
+# Format timestamp yang dicoba (urutan = prioritas) saat mendeteksi format dari sampel baris pertama
+TIMESTAMP_FORMATS = [
+    '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M',
+    '%d-%m-%Y %H:%M', '%m/%d/%Y %H:%M',
+    '%d/%m/%Y', '%Y-%m-%d' # Tambahkan format tanggal saja jika ada
+]
+
 # Interval update default dalam detik (3 jam = 10800 detik)
 DEFAULT_UPDATE_INTERVAL = 10800  # Default 3 jam
 # Catatan: Untuk debugging, Anda bisa mengubah ini ke 60 (1 menit)
 # DEFAULT_UPDATE_INTERVAL = 60 
 
+# Toleransi (detik) untuk tick timer fragment yang datang sedikit lebih awal dari interval
+UPDATE_TICK_TOLERANCE = 2.0
+
+# Pilihan interval update (label -> detik) untuk selectbox di sidebar
+UPDATE_OPTIONS = {
+    "1 minute": 60,
+    "5 minutes": 300,
+    "15 minutes": 900,
+    "30 minutes": 1800,
+    "1 hour": 3600,
+    "3 hours": 10800,
+    "6 hours": 21600,
+    "12 hours": 43200,
+    "24 hours": 86400
+}
+UPDATE_LABELS = list(UPDATE_OPTIONS)
+# Reverse map detik -> index opsi, agar default index selectbox didapat dengan satu lookup
+UPDATE_VALUE_TO_INDEX = {value: idx for idx, value in enumerate(UPDATE_OPTIONS.values())}
+
+# Nilai awal session state (selain waktu update, yang dihitung saat inisialisasi)
+SESSION_DEFAULTS = {
+    'update_interval': DEFAULT_UPDATE_INTERVAL,
+    'auto_update_enabled': True,
+    'csv_data': None,
+    'last_file_modified': None,
+    'selected_interval_label': '3 hours',
+}
+
 # Define the target timezone (Indonesia/Jakarta for WIB)
-INDONESIA_TIMEZONE = pytz.timezone('Asia/Jakarta')
+INDONESIA_TIMEZONE = ZoneInfo('Asia/Jakarta')
+
+# Level status sistem (0 = normal, 1 = warning, 2 = critical) -> (label, kelas CSS badge, kelas CSS alert)
+SYSTEM_STATUS_LEVELS = (
+    ("OPERATIONAL", "status-operational", "alert-normal"),
+    ("WARNING", "status-warning", "alert-warning"),
+    ("CRITICAL", "status-critical", "alert-critical"),
+)
+# Fraksi threshold yang memicu status WARNING
+WARNING_THRESHOLD_RATIO = 0.8
+
+# Kategori kolom Type/Status pada export CSV (urutan = kode Categorical)
+EXPORT_TYPE_CATEGORIES = ('Historical_Train', 'Historical_Test_Prediction', 'Future_Prediction')
+EXPORT_STATUS_CATEGORIES = ('Normal', 'Critical')
+
+# Label kolom Status tabel metrik: (batas, label) diurutkan dari yang terbaik; label terakhir untuk sisanya.
+# Metrik error (MSE/MAE) bagus jika di bawah batas, skor (R²/akurasi) bagus jika di atas batas.
+METRIC_STATUS_BANDS = {
+    'mse': (False, ((0.001, 'Good'), (0.01, 'Acceptable')), 'Poor'),
+    'mae': (False, ((0.01, 'Good'), (0.05, 'Acceptable')), 'Poor'),
+    'r2': (True, ((0.9, 'Excellent'), (0.8, 'Good')), 'Acceptable'),
+    'accuracy': (True, ((90, 'Excellent'),), 'Good'),
+}
 
 # =============================================================================
 # 🔐 SECURE AUTHENTICATION SYSTEM
 # =============================================================================
 
 def hash_password(password):
-    """Secure password hashing using SHA256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Secure password hashing using SHA256 (digest mentah 32 byte, tanpa encoding hex)"""
+    return hashlib.sha256(password.encode()).digest()
 
-# Industrial-grade user credentials
+# Industrial-grade user credentials: digest SHA256 yang sudah dihitung (hash_password(...).hex()),
+# sehingga import modul (termasuk reload saat file disimpan) tidak menjalankan SHA256.
+# Untuk mengganti password: python -c "import hashlib; print(hashlib.sha256(b'PASSWORD').hexdigest())"
 USER_CREDENTIALS = {
-    "engineer": hash_password("engineer123"),
-    "supervisor": hash_password("supervisor123"),
-    "admin": hash_password("admin123"),
+    "engineer": bytes.fromhex("80ca306ac6e68366dd0a26125c9647e0c61fac6668cec6016f5fe30fb12e99bd"),
+    "supervisor": bytes.fromhex("02423ab2e61297b8262449c93e19be42fb5bbb275860a7d93b1ebdc7b6535ed7"),
+    "admin": bytes.fromhex("240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9"),
 }
 
 USER_ROLES = {
@@ -85,9 +200,9 @@ def check_authentication():
     return st.session_state.get('authenticated', False)
 
 def authenticate_user(username, password):
-    if username in USER_CREDENTIALS:
-        return USER_CREDENTIALS[username] == hash_password(password)
-    return False
+    # Satu lookup dict; digest tersimpan sudah dihitung saat import, dibandingkan secara constant-time
+    stored = USER_CREDENTIALS.get(username)
+    return stored is not None and hmac.compare_digest(stored, hash_password(password))
 
 # =============================================================================
 # 🔄 AUTO-UPDATE FUNCTIONS
@@ -99,187 +214,399 @@ def get_current_localized_time():
 
 def init_session_state():
     """Initialize session state variables for auto-update functionality"""
-    if 'last_update_time' not in st.session_state:
-        st.session_state.last_update_time = get_current_localized_time()
-    
-    if 'update_interval' not in st.session_state:
-        st.session_state.update_interval = DEFAULT_UPDATE_INTERVAL
-    
-    if 'auto_update_enabled' not in st.session_state:
-        st.session_state.auto_update_enabled = True
+    ss = st.session_state
+    # Waktu dihitung hanya jika belum ada (get_current_localized_time mengalokasikan datetime baru)
+    if 'last_update_time' not in ss:
+        ss.last_update_time = get_current_localized_time()
     
-    if 'csv_data' not in st.session_state:
-        st.session_state.csv_data = None
+    # Pasangan monotonic dari last_update_time, untuk menghitung selisih waktu tanpa alokasi datetime
+    if 'last_update_monotonic' not in ss:
+        ss.last_update_monotonic = time.monotonic()
     
-    if 'last_file_modified' not in st.session_state:
-        st.session_state.last_file_modified = None
+    for key, value in SESSION_DEFAULTS.items():
+        ss.setdefault(key, value)
+
+def find_columns(columns, keywords):
+    """Kolom yang namanya mengandung salah satu `keywords` (case-insensitive), urutan dipertahankan."""
+    return [c for c in columns if any(keyword in c.lower() for keyword in keywords)]
+
+def detect_timestamp_format(series):
+    """Format TIMESTAMP_FORMATS pertama yang cocok dengan nilai non-null pertama `series`; None jika tidak ada."""
+    # first_valid_index berhenti di nilai non-null pertama (tanpa salinan kolom dari dropna)
+    first_index = series.first_valid_index()
+    if first_index is None:
+        return None
+    sample = str(series.loc[first_index]).strip()
+    for date_format in TIMESTAMP_FORMATS:
+        try:
+            datetime.strptime(sample, date_format)
+            return date_format
+        except ValueError:
+            continue
+    return None
+
+def parse_timestamp_column(series):
+    """
+    Parse kolom timestamp dalam satu kali lintasan: format dideteksi dari sampel lalu dipakai langsung,
+    fallback ke inferensi per baris (format='mixed'). `cache=True` men-deduplikasi string timestamp yang berulang.
+    Hasil dalam INDONESIA_TIMEZONE (timestamp naive dilokalkan, yang sudah membawa offset dikonversi);
+    None jika tidak ada nilai yang bisa di-parse atau kolom tidak bisa dijadikan datetime.
+    """
+    parsed = None
+    date_format = detect_timestamp_format(series)
+    if date_format is not None:
+        try:
+            parsed = pd.to_datetime(series, format=date_format, cache=True)
+        except (ValueError, TypeError):
+            parsed = None
+    try:
+        if parsed is None:
+            # Fallback jika format sampel tidak berlaku untuk seluruh kolom: pandas meng-infer per baris
+            # (format='mixed'), bukan satu format dari baris pertama yang membuat baris lain jadi NaT
+            parsed = pd.to_datetime(series, format='mixed', errors='coerce', cache=True)
+        if parsed.isna().all():
+            return None
+        # Kolom dengan offset (mis. "2024-01-01T00:00:00+07:00", atau sudah timestamp[tz] dari pyarrow)
+        # sudah tz-aware: tz_localize akan raise "Already tz-aware", jadi cukup dikonversi
+        if parsed.dt.tz is not None:
+            return parsed.dt.tz_convert(INDONESIA_TIMEZONE)
+        return parsed.dt.tz_localize(INDONESIA_TIMEZONE, ambiguous='NaT', nonexistent='NaT')
+    except (ValueError, TypeError, AttributeError):
+        # Mis. offset campuran (hasil dtype object, tanpa accessor .dt): pemanggil memakai timestamp generated
+        return None
+
+def sniff_csv_layout(file_path):
+    """
+    Deteksi delimiter, nama kolom header, dan tanda desimal dari sampel awal file (CSV_SNIFF_BYTES)
+    tanpa mem-parse seluruh file. Jika Sniffer gagal, dipakai delimiter yang paling sering muncul
+    di baris header (seri -> urutan CSV_DELIMITERS), atau ',' jika tidak ada sama sekali.
+    Desimal koma (mis. "0,14") hanya mungkin jika delimiter bukan koma.
+    """
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        sample = f.read(CSV_SNIFF_BYTES)
+    # Buang baris terakhir yang mungkin terpotong agar Sniffer hanya melihat baris utuh
+    if '\n' in sample:
+        sample = sample[:sample.rindex('\n')]
+    lines = sample.splitlines()
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        # Sniffer ragu (mis. hanya satu baris): pilih delimiter yang paling sering muncul di header
+        first_line = lines[0] if lines else ''
+        delimiter = max(CSV_DELIMITERS, key=first_line.count)
+        if not first_line.count(delimiter):
+            delimiter = ','
+    header = next(csv.reader(lines[:1], delimiter=delimiter), [])
+    decimal = ',' if delimiter != ',' and any(re.search(r'\d,\d', line) for line in lines[1:]) else '.'
+    return delimiter, header, decimal
+
+def read_csv_columns(file_path, delimiter, columns, decimal='.'):
+    """
+    Baca CSV per blok (CSV_BLOCK_SIZE) dengan reader streaming PyArrow dan hanya kolom `columns`
+    (list kosong = semua kolom). Angka dengan tanda `decimal` langsung dikonversi ke float oleh
+    PyArrow, bukan dibaca sebagai string. Buffer Arrow dilepas selama konversi ke pandas.
+    Fallback ke pandas C engine jika PyArrow gagal membaca file.
+    """
+    try:
+        reader = pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+            convert_options=pa_csv.ConvertOptions(include_columns=columns, decimal_point=decimal)
+        )
+        return reader.read_all().to_pandas(split_blocks=True, self_destruct=True)
+    except (ValueError, pa.ArrowException):
+        return pd.read_csv(file_path, sep=delimiter, usecols=columns or None, decimal=decimal,
+                           engine='c', low_memory=False)
+
+def downcast_columns(df):
+    """
+    Perkecil dtype untuk menghemat memori: float64 -> float32, int64 -> integer terkecil,
+    dan kolom teks berkardinalitas rendah (< CATEGORY_MAX_RATIO nilai unik) -> category.
+    """
+    for col in df.select_dtypes(include='float64').columns:
+        df[col] = df[col].astype(np.float32)
+    for col in df.select_dtypes(include='int64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    # Teks bisa bertipe object (pandas < 3) atau str/string (pandas 3, dan kolom string dari PyArrow)
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        if len(df) and df[col].nunique() / len(df) < CATEGORY_MAX_RATIO:
+            df[col] = df[col].astype('category')
+    return df
+
+def get_file_key(file_path):
+    """Fingerprint file (path, mtime, size) dari satu kali stat(); None jika file tidak ada."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (file_path, stat.st_mtime_ns, stat.st_size)
+
+def get_sidecar_path(file_path, file_key):
+    """Path sidecar Feather untuk satu versi file CSV (dikunci pada versi format sidecar, mtime, dan ukuran)."""
+    _, mtime_ns, size = file_key
+    return f"{file_path}.v{SIDECAR_FORMAT_VERSION}.{mtime_ns}.{size}.feather"
+
+def write_feather_sidecar(df, file_path, sidecar_path):
+    """
+    Simpan hasil parse CSV sebagai sidecar Feather dan hapus sidecar versi lama.
+    Sidecar hanya cache, jadi kegagalan menulis (folder read-only, tipe kolom tidak didukung) diabaikan.
+    """
+    tmp_path = f"{sidecar_path}.tmp{os.getpid()}"
+    try:
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, sidecar_path) # Atomic agar worker lain tidak membaca file setengah jadi
+    except (OSError, ValueError, pa.ArrowException):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
     
-    if 'selected_interval_label' not in st.session_state:
-        st.session_state.selected_interval_label = '3 hours'
+    for old_sidecar in glob.glob(glob.escape(file_path) + '.*.feather'):
+        if old_sidecar != sidecar_path:
+            try:
+                os.remove(old_sidecar)
+            except OSError:
+                pass
 
-# Menggunakan st.cache_data untuk caching data
-# ttl (Time To Live) diatur ke interval update, jadi data akan di-cache selama itu
-@st.cache_data(ttl=DEFAULT_UPDATE_INTERVAL)
-def load_csv_automatically(file_path):
+# Menggunakan st.cache_resource: satu DataFrame dipakai bersama (tanpa pickle/copy per akses)
+# Cache dikunci pada fingerprint file, bukan TTL: hit selama file tidak berubah, invalid begitu file berubah.
+# max_entries membatasi versi file yang disimpan (auto-update tidak meng-clear cache), jadi versi lama tergusur
+@st.cache_resource(max_entries=CSV_CACHE_MAX_ENTRIES)
+def load_csv_automatically(file_path, file_key):
     """
     Fungsi untuk memuat file CSV secara otomatis.
-    Menggunakan st.cache_data agar data di-cache selama interval tertentu.
-    Parameter `file_path` ditambahkan agar `st.cache_data` dapat mendeteksi perubahan jika path berubah (walaupun tidak akan di sini).
+    Menggunakan st.cache_resource dengan `file_key` (hasil `get_file_key`) sebagai kunci cache,
+    sehingga file hanya di-parse ulang jika mtime atau ukurannya berubah.
+    DataFrame hasilnya dipakai bersama lintas sesi: pemanggil tidak boleh memodifikasinya in-place.
+    Delimiter dan header dideteksi sekali dari sampel awal, lalu file di-parse tepat satu kali.
+    Hasil parse disimpan sebagai sidecar Feather; sesi berikutnya membaca sidecar via memory-map.
+    Error baca/parse sengaja tidak ditangkap di sini: Streamlit tidak meng-cache exception, sehingga
+    kegagalan sementara (file setengah ditulis/terkunci) dicoba ulang di rerun berikutnya,
+    bukan tersimpan sebagai None di bawah `file_key` yang sama. Pemanggil menampilkan error-nya.
     """
     st.sidebar.info(f"⚙️ Loading data from {os.path.basename(file_path)}...")
     
+    if file_key is None: # get_file_key mengembalikan None jika file tidak ada
+        st.sidebar.error(f"❌ File tidak ditemukan: {os.path.basename(file_path)}")
+        st.sidebar.info("Pastikan file CSV berada di folder yang sama dengan script ini")
+        return None
+    
+    sidecar_path = get_sidecar_path(file_path, file_key)
+    
     try:
-        if not os.path.exists(file_path):
-            st.sidebar.error(f"❌ File tidak ditemukan: {os.path.basename(file_path)}")
-            st.sidebar.info("Pastikan file CSV berada di folder yang sama dengan script ini")
-            return None
-        
-        delimiters = [',', ';', '\t']
-        df = None
-        
-        for delimiter in delimiters:
-            try:
-                df = pd.read_csv(file_path, sep=delimiter)
-                if len(df.columns) > 1: # Cek apakah sudah terbaca dengan benar (lebih dari 1 kolom)
-                    break
-            except Exception:
-                continue
+        # Versi file ini sudah pernah di-parse: baca kolom langsung dari sidecar tanpa tokenisasi teks
+        # (langsung dibuka tanpa os.path.exists: satu syscall lebih sedikit)
+        df = feather.read_table(sidecar_path, memory_map=True).to_pandas()
+    except FileNotFoundError:
+        delimiter, header, decimal = sniff_csv_layout(file_path)
         
-        if df is None:
-            st.sidebar.error(f"❌ Gagal membaca file: {os.path.basename(file_path)}. Coba format delimiter lain.")
+        if not header: # File kosong / header tidak terbaca
+            st.sidebar.error(f"❌ Gagal membaca file: {os.path.basename(file_path)}. Header CSV tidak ditemukan.")
             return None
+        # File satu kolom (mis. hanya tekanan) tetap diterima; timestamp akan digenerate
         
-        st.sidebar.success(f"✅ Data '{os.path.basename(file_path)}' dimuat!")
-        return df
+        # Hanya kolom timestamp/tekanan yang dipakai dashboard yang dibaca (projection pushdown)
+        usecols = find_columns(header, TIMESTAMP_KEYWORDS + PRESSURE_KEYWORDS)
+        df = read_csv_columns(file_path, delimiter, usecols, decimal)
         
-    except Exception as e:
-        st.sidebar.error(f"❌ Error loading CSV: {str(e)}")
-        return None
+        df = downcast_columns(df)
+        write_feather_sidecar(df, file_path, sidecar_path)
+    
+    st.sidebar.success(f"✅ Data '{os.path.basename(file_path)}' dimuat!")
+    return df
+    
 
 def check_and_update():
     """
     Cek apakah sudah waktunya update data.
-    Update otomatis jika interval waktu sudah tercapai dan auto-update aktif.
+    Jika interval waktu sudah tercapai dan auto-update aktif, fingerprint file dicek ulang
+    dan aplikasi hanya di-rerun jika file benar-benar berubah (cache CSV dikunci pada fingerprint).
+    Dijalankan oleh `run_auto_update_poller` sebagai bagian fragment, sehingga tick timer yang tidak
+    menemukan perubahan hanya menjalankan fragment itu, bukan seluruh script.
+    """
+    ss = st.session_state
+    # Jam monotonic (sama dengan countdown di sidebar): tidak terpengaruh perubahan jam sistem
+    elapsed = time.monotonic() - ss.last_update_monotonic
+    
+    if ss.auto_update_enabled and elapsed >= ss.update_interval - UPDATE_TICK_TOLERANCE:
+        ss.last_update_time = get_current_localized_time()
+        ss.last_update_monotonic = time.monotonic()
+        file_key = get_file_key(CSV_FILE_PATH)
+        if file_key != ss.last_file_modified:
+            ss.last_file_modified = file_key
+            st.rerun()
+
+def show_auto_update_status():
+    """
+    Isi fragment auto-update: `check_and_update`, lalu status, countdown, dan waktu update terakhir.
+    Ikut dirender ulang di setiap tick, sehingga countdown dan "Last Data Updated" ter-reset
+    walaupun file tidak berubah (tanpa rerun penuh).
     """
-    current_time = get_current_localized_time()
-    time_diff = (current_time - st.session_state.last_update_time).total_seconds()
+    ss = st.session_state
+    check_and_update()
+    
+    st.markdown("**Auto-Update Status:**")
+    if ss.auto_update_enabled:
+        components.html(render_countdown_html(), height=60)
+    else:
+        st.warning("⏸️ Auto-update disabled")
     
-    if time_diff >= st.session_state.update_interval and st.session_state.auto_update_enabled:
-        st.session_state.last_update_time = current_time
-        # Memaksa cache di-invalidate agar data dimuat ulang dari sumber
-        load_csv_automatically.clear() 
-        st.rerun()
+    st.markdown(f"**Last Data Updated:** {ss.last_update_time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+def run_auto_update_poller():
+    """
+    Jalankan `show_auto_update_status` sebagai fragment dengan timer di sisi client (`run_every`).
+    Timer dimatikan saat auto-update nonaktif. Dipanggil di dalam `with st.sidebar`.
+    """
+    ss = st.session_state
+    run_every = ss.update_interval if ss.auto_update_enabled else None
+    st.fragment(run_every=run_every)(show_auto_update_status)()
+
+def get_seconds_remaining():
+    """Sisa detik sampai update berikutnya (dihitung dari clock monotonic)"""
+    ss = st.session_state
+    return int(ss.update_interval - (time.monotonic() - ss.last_update_monotonic))
 
 def format_time_remaining():
-    """Format waktu yang tersisa sampai update berikutnya"""
-    current_time = get_current_localized_time()
-    time_diff = (current_time - st.session_state.last_update_time).total_seconds()
-    time_remaining = st.session_state.update_interval - time_diff
+    """Format waktu yang tersisa sampai update berikutnya (dihitung dari clock monotonic)"""
+    time_remaining = get_seconds_remaining()
     
     if time_remaining <= 0:
         return "Update pending..."
     
-    hours = int(time_remaining // 3600)
-    minutes = int((time_remaining % 3600) // 60)
-    seconds = int(time_remaining % 60)
+    hours, remainder = divmod(time_remaining, 3600)
+    minutes, seconds = divmod(remainder, 60)
     
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
+# Countdown auto-update yang berdetik di browser (setInterval), sehingga angka tetap berjalan
+# tanpa rerun Streamlit; server hanya mengirim sisa detik saat sidebar dirender
+COUNTDOWN_HTML_TEMPLATE = """
+<div style="font-family: 'Source Sans Pro', sans-serif; font-size: 0.9rem; padding: 12px 16px;
+            border-radius: 8px; background: rgba(28, 131, 225, 0.1); color: rgb(28, 131, 225);">
+    🕐 Next update in: <span id="eta">{initial}</span>
+</div>
+<script>
+    const deadline = Date.now() + {remaining_ms};
+    const eta = document.getElementById('eta');
+    const pad = (n) => String(n).padStart(2, '0');
+    const timer = setInterval(() => {{
+        const left = Math.floor((deadline - Date.now()) / 1000);
+        if (left <= 0) {{
+            eta.textContent = 'Update pending...';
+            clearInterval(timer);
+            return;
+        }}
+        eta.textContent = pad(Math.floor(left / 3600)) + ':' + pad(Math.floor(left % 3600 / 60)) + ':' + pad(left % 60);
+    }}, 1000);
+</script>
+"""
+
+def render_countdown_html():
+    """HTML + JS countdown client-side untuk sidebar, diawali dengan teks dari `format_time_remaining`."""
+    return COUNTDOWN_HTML_TEMPLATE.format_map({
+        'initial': format_time_remaining(),
+        'remaining_ms': max(get_seconds_remaining(), 0) * 1000,
+    })
+
+# Professional login styling (konstanta modul: string dibangun sekali saat import, bukan per rerun)
+LOGIN_PAGE_CSS = """
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
+    
+    .main {
+        background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+        font-family: 'Inter', sans-serif;
+    }
+    
+    .login-container {
+        max-width: 450px;
+        margin: 5% auto;
+        padding: 40px;
+        background: rgba(255, 255, 255, 0.95);
+        border-radius: 20px;
+        box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
+        backdrop-filter: blur(10px);
+    }
+    
+    .company-header {
+        text-align: center;
+        margin-bottom: 30px;
+    }
+    
+    .company-logo {
+        font-size: 3rem;
+        color: #1e3c72;
+        margin-bottom: 10px;
+    }
+    
+    .company-title {
+        color: #1e3c72;
+        font-size: 1.8rem;
+        font-weight: 700;
+        margin-bottom: 5px;
+    }
+    
+    .system-subtitle {
+        color: #666;
+        font-size: 1rem;
+        font-weight: 400;
+    }
+    
+    .login-form {
+        margin-top: 30px;
+    }
+    
+    .stTextInput > div > div > input {
+        border: 2px solid #e1e5e9;
+        border-radius: 10px;
+        padding: 12px 16px;
+        font-size: 1rem;
+        transition: all 0.3s ease;
+    }
+    
+    .stTextInput > div > div > input:focus {
+        border-color: #1e3c72;
+        box-shadow: 0 0 0 3px rgba(30, 60, 114, 0.1);
+    }
+    
+    .stButton > button {
+        width: 100%;
+        background: linear-gradient(135deg, #1e3c72, #2a5298);
+        border: none;
+        border-radius: 10px;
+        color: white;
+        font-weight: 600;
+        font-size: 1rem;
+        padding: 12px;
+        transition: all 0.3s ease;
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 10px 20px rgba(30, 60, 114, 0.3);
+    }
+    
+    .security-footer {
+        text-align: center;
+        margin-top: 30px;
+        padding-top: 20px;
+        border-top: 1px solid #e1e5e9;
+        color: #666;
+        font-size: 0.9rem;
+    }
+    
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+</style>
+"""
+
 def login_page():
     # st.set_page_config() dihapus dari sini karena sudah ada di paling atas
     
     # Professional login styling
-    st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-        
-        .main {
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            font-family: 'Inter', sans-serif;
-        }
-        
-        .login-container {
-            max-width: 450px;
-            margin: 5% auto;
-            padding: 40px;
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 20px;
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-            backdrop-filter: blur(10px);
-        }
-        
-        .company-header {
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        
-        .company-logo {
-            font-size: 3rem;
-            color: #1e3c72;
-            margin-bottom: 10px;
-        }
-        
-        .company-title {
-            color: #1e3c72;
-            font-size: 1.8rem;
-            font-weight: 700;
-            margin-bottom: 5px;
-        }
-        
-        .system-subtitle {
-            color: #666;
-            font-size: 1rem;
-            font-weight: 400;
-        }
-        
-        .login-form {
-            margin-top: 30px;
-        }
-        
-        .stTextInput > div > div > input {
-            border: 2px solid #e1e5e9;
-            border-radius: 10px;
-            padding: 12px 16px;
-            font-size: 1rem;
-            transition: all 0.3s ease;
-        }
-        
-        .stTextInput > div > div > input:focus {
-            border-color: #1e3c72;
-            box-shadow: 0 0 0 3px rgba(30, 60, 114, 0.1);
-        }
-        
-        .stButton > button {
-            width: 100%;
-            background: linear-gradient(135deg, #1e3c72, #2a5298);
-            border: none;
-            border-radius: 10px;
-            color: white;
-            font-weight: 600;
-            font-size: 1rem;
-            padding: 12px;
-            transition: all 0.3s ease;
-        }
-        
-        .stButton > button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 10px 20px rgba(30, 60, 114, 0.3);
-        }
-        
-        .security-footer {
-            text-align: center;
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #e1e5e9;
-            color: #666;
-            font-size: 0.9rem;
-        }
-        
-        #MainMenu {visibility: hidden;}
-        footer {visibility: hidden;}
-        header {visibility: hidden;}
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(LOGIN_PAGE_CSS, unsafe_allow_html=True)
     
     # Login container
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -310,8 +637,8 @@ def login_page():
                         st.session_state['authenticated'] = True
                         st.session_state['username'] = username
                         st.session_state['user_info'] = USER_ROLES.get(username, {})
-                        st.success("✅ Authentication successful! Loading system...")
-                        time.sleep(1) # Beri sedikit waktu untuk pesan sukses terlihat
+                        # Tanpa sleep yang memblokir worker: notifikasi sukses ditampilkan di frame pertama dashboard
+                        st.session_state['just_logged_in'] = True
                         st.rerun() # Memuat ulang aplikasi untuk masuk ke dashboard
                     else:
                         st.error("❌ Invalid credentials. Access denied.")
@@ -327,31 +654,57 @@ def login_page():
         """, unsafe_allow_html=True)
 
 def logout():
-    for key in ['authenticated', 'username', 'user_info', 'csv_data', 'last_file_modified', 'last_update_time']:
-        if key in st.session_state:
-            del st.session_state[key]
-    # Hapus cache st.cache_data agar data dimuat ulang saat login berikutnya
-    load_csv_automatically.clear() 
+    # Hapus seluruh state sesi (termasuk key widget dan halaman tabel), bukan hanya daftar key tertentu,
+    # agar tidak ada data user sebelumnya yang tertinggal di tab ini
+    st.session_state.clear()
+    # Cache data tidak dihapus: dikunci pada fingerprint file dan dipakai bersama sesi lain,
+    # dan data otomatis dimuat ulang saat login berikutnya jika file berubah
     st.rerun()
 
-def show_user_panel():
-    """Professional user information panel with auto-update controls"""
-    if 'user_info' in st.session_state:
-        user_info = st.session_state['user_info']
-        st.sidebar.markdown("### 👤 User Profile")
-        
-        # User card
-        st.sidebar.markdown(f"""
+# Template kartu user di sidebar (konstanta modul; diisi dengan format_map)
+USER_CARD_TEMPLATE = """
         <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
                     padding: 15px; border-radius: 10px; margin-bottom: 20px;">
             <div style="color: white; font-weight: 600; font-size: 1.1rem;">
-                {user_info.get('name', 'User')}
+                {name}
             </div>
             <div style="color: rgba(255,255,255,0.8); font-size: 0.9rem;">
-                {user_info.get('role', 'User')} • {user_info.get('department', 'General')}
+                {role} • {department}
             </div>
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+def render_user_card_html(name, role, department):
+    """HTML kartu user di sidebar; nilai di-escape karena dirender dengan unsafe_allow_html"""
+    return USER_CARD_TEMPLATE.format_map({
+        'name': html.escape(name),
+        'role': html.escape(role),
+        'department': html.escape(department),
+    })
+
+def apply_auto_update_settings():
+    """Callback tombol Apply: salin nilai form auto-update ke session state."""
+    ss = st.session_state
+    ss.auto_update_enabled = ss.auto_update_enabled_input
+    ss.selected_interval_label = ss.update_interval_selector
+    ss.update_interval = UPDATE_OPTIONS[ss.update_interval_selector]
+
+def show_user_panel(file_key):
+    """
+    Professional user information panel with auto-update controls.
+    `file_key`: fingerprint CSV dari `get_file_key` (satu stat() per rerun, dipakai bersama main_dashboard).
+    """
+    ss = st.session_state # Binding lokal: satu lookup proxy session state per rerun
+    if 'user_info' in ss:
+        user_info = ss['user_info']
+        st.sidebar.markdown("### 👤 User Profile")
+        
+        # User card
+        st.sidebar.markdown(render_user_card_html(
+            user_info.get('name', 'User'),
+            user_info.get('role', 'User'),
+            user_info.get('department', 'General')
+        ), unsafe_allow_html=True)
         
         # Permissions
         permissions = user_info.get('permissions', [])
@@ -364,69 +717,55 @@ def show_user_panel():
         # Auto-update controls
         st.sidebar.markdown("### 🔄 Auto-Update Settings")
         
-        # Toggle auto-update
-        st.session_state.auto_update_enabled = st.sidebar.checkbox(
-            "Enable Auto-Update",
-            value=st.session_state.auto_update_enabled,
-            help="Automatically refresh data at specified intervals"
-        )
-        
-        # Update interval selection
-        update_options = {
-            "1 minute": 60,
-            "5 minutes": 300,
-            "15 minutes": 900,
-            "30 minutes": 1800,
-            "1 hour": 3600,
-            "3 hours": 10800,
-            "6 hours": 21600,
-            "12 hours": 43200,
-            "24 hours": 86400
-        }
-        
-        # Get current interval value and find corresponding label
-        current_interval_value = st.session_state.get('update_interval', DEFAULT_UPDATE_INTERVAL)
-        
-        # Ensure default_index is valid
-        default_index = 0
-        for idx, (label, value) in enumerate(update_options.items()):
-            if value == current_interval_value:
-                default_index = idx
-                break
-        
-        selected_interval = st.sidebar.selectbox(
-            "Update Interval",
-            options=list(update_options.keys()),
-            index=default_index,
-            key="update_interval_selector", # Tambahkan key unik
-            help="How often to refresh the data"
-        )
+        # Get current interval value and find corresponding label (fallback ke opsi pertama)
+        current_interval_value = ss.get('update_interval', DEFAULT_UPDATE_INTERVAL)
+        default_index = UPDATE_VALUE_TO_INDEX.get(current_interval_value, 0)
         
-        # Pastikan session state update_interval diperbarui hanya jika ada perubahan
-        if update_options[selected_interval] != st.session_state.update_interval:
-            st.session_state.update_interval = update_options[selected_interval]
-            # Clear cache st.cache_data jika interval berubah agar TTL baru diterapkan
-            load_csv_automatically.clear() 
-            st.rerun() # Rerun untuk menerapkan interval baru
-
-        st.session_state.selected_interval_label = selected_interval
-        
-        # Show current status
-        st.sidebar.markdown("**Auto-Update Status:**")
-        if st.session_state.auto_update_enabled:
-            st.sidebar.info(f"🕐 Next update in: {format_time_remaining()}")
-        else:
-            st.sidebar.warning("⏸️ Auto-update disabled")
+        # Kontrol dikumpulkan dalam form: mengubah checkbox/selectbox tidak memicu rerun,
+        # pengaturan baru diterapkan sekali saat tombol Apply ditekan
+        with st.sidebar.form("autoupdate_settings"):
+            # Toggle auto-update
+            st.checkbox(
+                "Enable Auto-Update",
+                value=ss.auto_update_enabled,
+                key="auto_update_enabled_input",
+                help="Automatically refresh data at specified intervals"
+            )
+            
+            # Update interval selection
+            st.selectbox(
+                "Update Interval",
+                options=UPDATE_LABELS,
+                index=default_index,
+                key="update_interval_selector", # Tambahkan key unik
+                help="How often to refresh the data"
+            )
+            
+            # Callback dijalankan sebelum script rerun: timer auto-update di awal dashboard
+            # langsung memakai pengaturan baru tanpa st.rerun() tambahan
+            st.form_submit_button("Apply", on_click=apply_auto_update_settings)
         
-        # Manual refresh button
+        # Manual refresh button (sebelum status, agar reset waktu update langsung tampil di run yang sama)
         if st.sidebar.button("🔄 Refresh Now", type="secondary"):
-            # Clear cache st.cache_data saat refresh manual
-            load_csv_automatically.clear()
-            st.session_state.last_update_time = get_current_localized_time() # Reset waktu terakhir update
-            st.rerun() # Memuat ulang aplikasi
+            # Klik tombol sudah memicu rerun, dan data dimuat setelah panel ini: tidak perlu st.rerun() tambahan.
+            # Cache dikunci pada fingerprint file: hanya dibersihkan jika file berubah (membuang entri versi lama).
+            # Gagal baca/parse tidak pernah di-cache, jadi klik ini tetap mencoba ulang file yang sama
+            if file_key != ss.get('last_file_modified'):
+                load_csv_automatically.clear()
+                prepare_sensor_data.clear()
+                predict_sensor_data.clear()
+                build_error_histogram.clear()
+                build_export_csv.clear()
+                downsample_chart_traces.clear()
+            else:
+                st.toast("Data sudah terbaru (file tidak berubah).", icon="✅")
+            ss.last_update_time = get_current_localized_time() # Reset waktu terakhir update
+            ss.last_update_monotonic = time.monotonic()
         
-        # Show last update time
-        st.sidebar.markdown(f"**Last Data Updated:** {st.session_state.last_update_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        # Status, countdown, dan waktu update terakhir dirender oleh fragment timer auto-update
+        # (st.rerun penuh hanya jika file CSV berubah)
+        with st.sidebar:
+            run_auto_update_poller()
         
         st.sidebar.markdown("---")
         
@@ -434,11 +773,12 @@ def show_user_panel():
         st.sidebar.markdown("### 📄 Data Source")
         st.sidebar.info(f"**CSV File:** {CSV_FILE_NAME}")
         
-        if os.path.exists(CSV_FILE_PATH):
-            file_size = os.path.getsize(CSV_FILE_PATH) / 1024  # KB
+        # Keberadaan, ukuran, dan waktu modifikasi file diambil dari fingerprint (tanpa stat() tambahan)
+        if file_key is not None:
+            _, file_mtime_ns, file_size_bytes = file_key
+            file_size = file_size_bytes / 1024  # KB
             # Convert file modified time to localized time
-            file_modified_utc = datetime.fromtimestamp(os.path.getmtime(CSV_FILE_PATH), pytz.utc)
-            file_modified_local = file_modified_utc.astimezone(INDONESIA_TIMEZONE)
+            file_modified_local = datetime.fromtimestamp(file_mtime_ns / 1e9, INDONESIA_TIMEZONE)
             st.sidebar.markdown(f"**Size:** {file_size:.2f} KB")
             st.sidebar.markdown(f"**Modified:** {file_modified_local.strftime('%Y-%m-%d %H:%M:%S %Z%z')}") # Add timezone info
         else:
@@ -450,26 +790,460 @@ def show_user_panel():
             logout()
 
 # =============================================================================
-# 📊 INDUSTRIAL DASHBOARD MAIN SYSTEM
+# 🧠 PREDICTIVE MODEL
 # =============================================================================
 
-def main_dashboard():
-    """Professional Industrial Dashboard with Auto-Update"""
+@st.cache_resource(show_spinner="🧠 Loading LSTM model...")
+def get_lstm_model(model_path):
+    """
+    Muat model LSTM sekali per proses dan bagikan ke semua sesi.
+    TensorFlow di-import di sini (lazy) agar halaman login tidak menanggung biaya import TF.
+    """
+    from tensorflow.keras.models import load_model
+    return load_model(model_path, compile=False)
+
+@st.cache_resource
+def get_lstm_predictor(model_path):
+    """
+    Bangun fungsi inferensi graph-mode (tf.function) untuk model LSTM sekali per proses.
+    Input signature tetap (batch, timesteps, 1) float32 sehingga graph tidak di-trace ulang
+    antar panggilan, dan overhead loop `model.predict` (callbacks, progress bar) dihindari.
+    Graph dikompilasi dengan XLA (kernel LSTM di-fuse); jika XLA gagal untuk model ini,
+    otomatis kembali ke graph biasa.
+    Input besar dipecah per PREDICT_BATCH_SIZE dan tiap potongan di-pad ke pangkat dua,
+    sehingga jumlah shape yang dikompilasi XLA tetap kecil walau panjang data berubah.
+    Window strided disalin tepat sekali per potongan ke buffer kontigu milik panggilan ini
+    (bukan dibagi antar sesi), tanpa array padding/concatenate baru per potongan.
+    Mengembalikan fungsi `predict(batch) -> np.ndarray` dengan shape (batch, 1).
+    """
+    import tensorflow as tf
+    model = get_lstm_model(model_path)
+    input_signature = [tf.TensorSpec(shape=(None, None, 1), dtype=tf.float32)]
     
-    # Initialize session state (Pastikan ini dipanggil setiap kali main_dashboard dijalankan)
-    init_session_state()
+    @tf.function(input_signature=input_signature, jit_compile=True)
+    def infer_xla(batch):
+        return model(batch, training=False)
     
-    # Check for auto-update (akan memicu st.rerun jika waktunya update)
-    check_and_update()
+    @tf.function(input_signature=input_signature)
+    def infer_graph(batch):
+        return model(batch, training=False)
     
-    # st.set_page_config() dihapus dari sini karena sudah ada di paling atas
+    active = {'infer': infer_xla}
     
-    # Professional industrial styling (dengan variabel CSS untuk tema gelap/terang)
-    st.markdown(f"""
+    def run(batch):
+        tensor = tf.convert_to_tensor(batch, dtype=tf.float32)
+        try:
+            return active['infer'](tensor).numpy()
+        except tf.errors.OpError:
+            if active['infer'] is infer_graph:
+                raise
+            # Op tidak didukung XLA: pakai graph biasa untuk sisa umur proses
+            active['infer'] = infer_graph
+            return infer_graph(tensor).numpy()
+    
+    def predict(batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        n = len(batch)
+        if n <= 1: # Langkah autoregresif (batch 1) langsung dijalankan
+            return run(batch)
+        # Potongan pertama adalah yang terbesar, jadi bucket-nya cukup untuk semua potongan berikutnya
+        first_bucket = min(PREDICT_BATCH_SIZE, 1 << (min(n, PREDICT_BATCH_SIZE) - 1).bit_length())
+        staging = np.empty((first_bucket,) + batch.shape[1:], dtype=np.float32)
+        outputs = np.empty((n, 1), dtype=np.float32)
+        for start in range(0, n, PREDICT_BATCH_SIZE):
+            chunk = batch[start:start + PREDICT_BATCH_SIZE]
+            size = len(chunk)
+            bucket = min(PREDICT_BATCH_SIZE, 1 << (size - 1).bit_length())
+            staging[:size] = chunk
+            staging[size:bucket] = 0.0
+            outputs[start:start + size] = run(staging[:bucket])[:size]
+        return outputs
+    
+    # Warm-up: trace graph (dan putuskan XLA vs graph biasa) sekali saat model dimuat,
+    # bukan pada inferensi pertama yang dilihat pengguna
+    warmup_timesteps = getattr(model, 'input_shape', (None, None))[1] or DEFAULT_SEQUENCE_LENGTH
+    run(np.zeros((1, warmup_timesteps, 1), dtype=np.float32))
+    
+    return predict
+
+@st.cache_resource
+def get_lstm_forecaster(model_path):
+    """
+    Bangun forecast autoregresif (prediksi -> geser window -> prediksi lagi) sebagai satu eksekusi
+    graph (tf.while_loop) sekali per proses: seluruh langkah berjalan di dalam TF, tanpa dispatch
+    Python dan konversi NumPy <-> Tensor per langkah.
+    Jika graph gagal dijalankan, otomatis kembali ke loop Python di atas `get_lstm_predictor`.
+    Mengembalikan fungsi `forecast(last_sequence, steps) -> np.ndarray` (nilai terskala, shape (steps,)).
+    """
+    import tensorflow as tf
+    model = get_lstm_model(model_path)
+    predict = get_lstm_predictor(model_path)
+    
+    @tf.function(input_signature=[
+        tf.TensorSpec(shape=(None, 1), dtype=tf.float32),
+        tf.TensorSpec(shape=(), dtype=tf.int32)
+    ])
+    def rollout(window, steps):
+        outputs = tf.TensorArray(tf.float32, size=steps)
+        
+        def body(i, window, outputs):
+            next_value = model(window[tf.newaxis], training=False)[0] # Shape (1,)
+            outputs = outputs.write(i, next_value[0])
+            # Geser window: buang elemen pertama, tambahkan prediksi baru
+            window = tf.concat([window[1:], next_value[tf.newaxis]], axis=0)
+            return i + 1, window, outputs
+        
+        _, _, outputs = tf.while_loop(lambda i, window, outputs: i < steps, body, [0, window, outputs])
+        return outputs.stack()
+    
+    def forecast(last_sequence, steps):
+        window = np.asarray(last_sequence, dtype=np.float32).reshape(-1, 1)
+        try:
+            return rollout(tf.convert_to_tensor(window), tf.constant(steps, dtype=tf.int32)).numpy()
+        except tf.errors.OpError:
+            predicted = np.empty(steps, dtype=np.float32)
+            for i in range(steps):
+                predicted[i] = predict(window[np.newaxis])[0, 0]
+                window = np.concatenate([window[1:], predicted[i:i + 1, np.newaxis]])
+            return predicted
+    
+    # Warm-up: trace graph rollout (signature tetap, jadi tidak di-trace ulang) dengan satu langkah dummy
+    warmup_timesteps = getattr(model, 'input_shape', (None, None))[1] or DEFAULT_SEQUENCE_LENGTH
+    forecast(np.zeros((warmup_timesteps, 1), dtype=np.float32), 1)
+    
+    return forecast
+
+def fit_minmax_scaling(values):
+    """
+    Parameter scaling MinMax (0, 1) satu kolom sebagai pasangan affine (scale, offset): scaled = x * scale + offset.
+    Setara MinMaxScaler sklearn (scale_ dan min_), termasuk data konstan (rentang 0 -> scale 1),
+    tanpa import sklearn dan validasi array.
+    """
+    data_min = float(values.min())
+    data_range = float(values.max()) - data_min
+    scale = 1.0 / data_range if data_range != 0 else 1.0
+    return scale, -data_min * scale
+
+def inverse_scale(scaling, values):
+    """
+    Inverse scaling MinMax untuk satu kolom sebagai operasi affine 1D: (x - offset) / scale,
+    ditulis sebagai satu multiply-add dengan dua skalar (tanpa pembagian per elemen).
+    `scaling` adalah pasangan (scale, offset) dari `fit_minmax_scaling`.
+    """
+    scale, offset = scaling
+    inv_scale = 1.0 / scale
+    return np.ravel(values) * inv_scale - offset * inv_scale
+
+def create_sequences(data, seq_length):
+    """
+    Window (N - seq_length, seq_length, 1) sebagai view strided tanpa copy (sliding_window_view),
+    dengan target = nilai setelah tiap window. -seq_length karena kita memprediksi 1 langkah ke depan.
+    Tidak ada loop Python maupun list window; copy kontigu (jika perlu) terjadi sekali saat inferensi.
+    """
+    if len(data) <= seq_length:
+        return np.empty((0, seq_length, 1), dtype=data.dtype), np.empty((0, 1), dtype=data.dtype)
+    windows = np.lib.stride_tricks.sliding_window_view(data[:, 0], seq_length)
+    return windows[:-1, :, None], data[seq_length:] # Target adalah nilai setelah sequence
+
+@st.cache_data(show_spinner="🔄 Processing sensor data...", max_entries=CSV_CACHE_MAX_ENTRIES)
+def prepare_sensor_data(file_path, file_key):
+    """
+    Parsing timestamp, pembersihan nilai tekanan, dan scaling, di-cache per versi file CSV (`file_key`).
+    Window LSTM sengaja tidak ikut di-cache: sliding_window_view atas scaled data hampir gratis,
+    sedangkan array window (N x sequence_length) harus di-pickle ulang di setiap cache hit.
+    Returns (timestamps_all, ground_truth_all, scaled_data_all, scaling) atau None jika data tidak tersedia;
+    `scaling` adalah pasangan (scale, offset) MinMax dari `fit_minmax_scaling`.
+    """
+    df = load_csv_automatically(file_path, file_key)
+    if df is None:
+        return None
+    
+    # Identify columns
+    timestamp_cols = find_columns(df.columns, TIMESTAMP_KEYWORDS)
+    
+    pressure_cols = find_columns(df.columns, PRESSURE_KEYWORDS)
+    
+    if not pressure_cols:
+        st.error("❌ Pressure column not found. Please ensure your data contains pressure measurements.")
+        return None
+    
+    pressure_col = pressure_cols[0]
+    
+    # Process timestamps
+    if timestamp_cols:
+        timestamp_col = timestamp_cols[0]
+        parsed_dates = parse_timestamp_column(df[timestamp_col])
+        
+        if parsed_dates is None:
+            st.sidebar.warning("⚠️ Could not parse timestamp column. Generating timestamps and localizing.")
+            # Asumsi interval data per jam jika tidak ada timestamp, dan lokal ke Asia/Jakarta
+            parsed_dates = pd.date_range(start=get_current_localized_time() - timedelta(hours=len(df)-1), periods=len(df), freq='H', tz=INDONESIA_TIMEZONE)
+        
+        timestamps = parsed_dates
+    else:
+        timestamps = pd.date_range(start=get_current_localized_time() - timedelta(hours=len(df)-1), periods=len(df), freq='H', tz=INDONESIA_TIMEZONE)
+        st.sidebar.warning("⚠️ No timestamp column found. Using generated localized timestamps.")
+    
+    # Clean and prepare data
+    # Satu Series tekanan saja; parse numerik langsung, dan replace koma-desimal hanya untuk baris
+    # yang gagal di-parse (mis. "0,14" dari fallback), bukan roundtrip string untuk seluruh kolom
+    raw_pressure = df[pressure_col]
+    pressure = pd.to_numeric(raw_pressure, errors='coerce')
+    if not pd.api.types.is_numeric_dtype(raw_pressure):
+        retry = pressure.isna() & raw_pressure.notna()
+        if retry.any():
+            pressure.loc[retry] = pd.to_numeric(
+                raw_pressure[retry].astype(str).str.replace(',', '.', regex=False), errors='coerce'
+            )
+    # float32 end-to-end (sama dengan bobot LSTM): TF tidak perlu cast ulang input, bandwidth window/inferensi separuh.
+    # Satu-satunya salinan data tekanan; copy=True menjamin buffer milik sendiri (bukan view DataFrame
+    # cache_resource), sehingga clip di bawah aman dilakukan in-place
+    ground_truth_all = pressure.dropna().to_numpy(dtype=np.float32, copy=True)
+    
+    # Remove negative values
+    if (ground_truth_all < 0).any():
+        st.sidebar.warning("⚠️ Negative values detected and clipped to zero.")
+        np.maximum(ground_truth_all, 0, out=ground_truth_all)
+    
+    # DatetimeIndex (int64 + timezone), bukan list objek Timestamp: slicing tanpa copy, pickle cache ringkas
+    timestamps_all = pd.DatetimeIndex(timestamps)[:len(ground_truth_all)]
+    
+    # Scaling - Pindahkan ini ke atas, sebelum digunakan
+    # Fit MinMax = min/max satu kolom (ikut ter-cache per versi file bersama hasil fungsi ini)
+    scaling = fit_minmax_scaling(ground_truth_all)
+    scale, offset = scaling
+    # Transform MinMax satu kolom sebagai affine (x * scale + offset) langsung di array float32
+    scaled_data_all = (ground_truth_all * scale + offset).astype(np.float32, copy=False)[:, None]
+    
+    return timestamps_all, ground_truth_all, scaled_data_all, scaling
+
+@st.cache_data(show_spinner="🧠 Running LSTM inference...", max_entries=PREDICTION_CACHE_MAX_ENTRIES)
+def predict_sensor_data(model_path, file_key, sequence_length, future_steps, _scaled_data_all):
+    """
+    Inferensi LSTM (overlay seluruh histori + forecast autoregresif) di-cache per versi file CSV dan sequence_length.
+    Perubahan threshold, pagination, atau tick auto-update tanpa file baru memakai hasil yang sama tanpa menjalankan model.
+    `_scaled_data_all` (prefix underscore) tidak di-hash; isinya diwakili oleh `file_key`.
+    Returns (predictions_on_all_viz (M, 1), future_predictions (future_steps,)), keduanya masih terskala.
+    """
+    X_all_viz_data, _ = create_sequences(_scaled_data_all, sequence_length)
+    if len(X_all_viz_data) > 0:
+        predictions_on_all_viz = get_lstm_predictor(model_path)(X_all_viz_data)
+    else:
+        predictions_on_all_viz = np.empty((0, 1), dtype=np.float32)
+    # Forecast dimulai dari sequence terakhir data historis yang diskalakan
+    future_predictions = get_lstm_forecaster(model_path)(_scaled_data_all[-sequence_length:], future_steps)
+    return predictions_on_all_viz, future_predictions
+
+# =============================================================================
+# 📈 CHART & TABLE BUILDERS
+# =============================================================================
+
+# Layout statis chart utama (dict biasa, dibangun sekali saat import); garis threshold ditambahkan per rerun
+MAIN_CHART_LAYOUT = dict(
+    height=600,
+    showlegend=True,
+    title=dict(
+        text="Industrial Gas Removal System - Process Monitoring & Prediction",
+        x=0.5,
+        font=dict(size=20)
+    ),
+    template="plotly_white",
+    xaxis=dict(title="Time", tickformat="%Y-%m-%d %H:%M:%S"), # Ensure x-axis shows full timestamp
+    yaxis=dict(title="Pressure"),
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=1.02,
+        xanchor="right",
+        x=1
+    )
+)
+
+def lttb_indices(y, n_out):
+    """
+    Indeks titik terpilih menurut Largest-Triangle-Three-Buckets (LTTB), dengan posisi sampel sebagai sumbu x.
+    Titik pertama dan terakhir selalu dipertahankan; bentuk puncak/lembah tetap terlihat.
+    Mengembalikan semua indeks jika `y` tidak lebih panjang dari `n_out`.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    # n_out - 2 bucket di antara titik pertama dan terakhir
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i < n_out - 3:
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = (next_start + next_end - 1) / 2.0
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = n - 1, y[-1]
+        xs = np.arange(start, end)
+        areas = np.abs((a - avg_x) * (y[start:end] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+def downsample_for_chart(x, y, n_out=CHART_MAX_POINTS):
+    """Kurangi trace (x, y) ke maksimal `n_out` titik dengan LTTB sebelum dikirim ke browser."""
+    idx = lttb_indices(y, n_out)
+    if len(idx) == len(y):
+        return x, y
+    return x[idx], np.asarray(y)[idx]
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def downsample_chart_traces(file_key, sequence_length, _traces):
+    """
+    LTTB untuk semua trace chart utama, di-cache per versi file CSV dan sequence_length
+    (dua hal yang menentukan isi trace), sehingga rerun biasa tidak mengulang loop bucket LTTB.
+    `_traces` (prefix underscore, tidak di-hash) berisi pasangan (x, y) per trace; urutan hasil sama.
+    """
+    return [downsample_for_chart(x, y) for x, y in _traces]
+
+def grade_metric(name, value):
+    """Label status untuk satu metrik menurut METRIC_STATUS_BANDS."""
+    higher_is_better, bands, fallback = METRIC_STATUS_BANDS[name]
+    for limit, label in bands:
+        if (value > limit) if higher_is_better else (value < limit):
+            return label
+    return fallback
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_metrics_table(mse, mae, r2, accuracy, accuracy_tolerance):
+    """Tabel metrik performa test set; di-cache per nilai metrik sehingga rerun biasa memakai tabel yang sama."""
+    return pd.DataFrame({
+        'Metric': ['Mean Squared Error (Test)', 'Mean Absolute Error (Test)', 'R² Score (Test)', f'Accuracy (±{accuracy_tolerance}) (Test)'],
+        'Value': [f"{mse:.6f}", f"{mae:.6f}", f"{r2:.4f}", 
+                  f"{accuracy:.2f}%"],
+        'Status': [grade_metric('mse', mse), grade_metric('mae', mae),
+                   grade_metric('r2', r2), grade_metric('accuracy', accuracy)]
+    })
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_error_histogram(file_key, sequence_length, _abs_error):
+    """
+    Figure histogram error absolut test set.
+    Kunci cache = versi file + sequence_length (yang menentukan `_abs_error`); array error
+    sendiri tidak di-hash (prefix underscore) agar lookup cache tetap murah.
+    Bin dihitung dengan np.histogram dan digambar sebagai Bar, sehingga payload ke browser
+    hanya ERROR_HISTOGRAM_BINS pasangan (pusat bin, count), bukan seluruh nilai error.
+    """
+    import plotly.graph_objects as go
+    counts, edges = np.histogram(_abs_error, bins=ERROR_HISTOGRAM_BINS)
+    fig_dist = go.Figure()
+    fig_dist.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        name='Error Distribution',
+        marker_color='rgba(46, 134, 171, 0.7)'
+    ))
+    fig_dist.update_layout(
+        title="Prediction Error Distribution (Test Set)",
+        xaxis_title="Absolute Error",
+        yaxis_title="Frequency",
+        template="plotly_white",
+        height=300,
+        bargap=0 # Bar bersebelahan seperti histogram
+    )
+    return fig_dist
+
+def format_local_timestamps(index):
+    """
+    Format DatetimeIndex ber-timezone sebagai '%Y-%m-%d %H:%M:%S %Z%z' (hasil sama dengan `.strftime`) secara massal.
+    Waktu lokal naive diformat lewat fast path pandas (tanpa objek Timestamp per baris), lalu sufiks zona
+    (%Z%z) diformat sekali per offset UTC unik dan ditempelkan. NaT menjadi NaN seperti `.strftime`.
+    """
+    if index.tz is None:
+        return np.asarray(index.strftime('%Y-%m-%d %H:%M:%S %Z%z'), dtype=object)
+    local = index.tz_localize(None)
+    text = np.asarray(local.strftime('%Y-%m-%d %H:%M:%S'), dtype=object)
+    valid_pos = np.flatnonzero(~index.isna())
+    # asi8: waktu dinding lokal vs UTC dalam nanodetik; selisihnya adalah offset zona per baris
+    offsets = (local.asi8 - index.asi8)[valid_pos]
+    _, first_idx, inverse = np.unique(offsets, return_index=True, return_inverse=True)
+    suffixes = np.array([index[valid_pos[i]].strftime(' %Z%z') for i in first_idx], dtype=object)
+    text[valid_pos] = text[valid_pos] + suffixes[inverse.ravel()]
+    return text
+
+def concat_segments(parts, sizes):
+    """
+    Rangkai segmen satu kolom export; segmen None diisi NaN sepanjang ukurannya di `sizes`.
+    Tetap float32 (dtype data tekanan): upcast ke float64 membuat CSV menulis 0.14 sebagai 0.14000000059604645.
+    """
+    return np.concatenate([
+        np.full(size, np.nan, dtype=np.float32) if part is None else np.asarray(part, dtype=np.float32)
+        for part, size in zip(parts, sizes)
+    ])
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_export_csv(file_key, sequence_length, threshold, _historical, _test, _future):
+    """
+    Bytes CSV analisis (train aktual + prediksi test + forecast), di-cache per versi file, sequence_length, dan threshold.
+    Ketiga kunci itu menentukan seluruh isi export; array (prefix underscore) tidak di-hash oleh Streamlit.
+    `_historical` = (timestamps_all, ground_truth_all, train_size),
+    `_test` = (test_timestamps, actual_test_inv, predictions_on_test_inv, abs_error_test),
+    `_future` = (future_timestamps, future_predictions_inv).
+    """
+    timestamps_all, ground_truth_all, train_size = _historical
+    test_timestamps, actual_test_inv, predictions_on_test_inv, abs_error_test = _test
+    future_timestamps, future_predictions_inv = _future
+    
+    # Tiga segmen (train aktual, prediksi test, forecast) dirangkai per kolom dengan np.concatenate
+    # lalu dibangun sebagai satu DataFrame; kolom yang tidak berlaku untuk suatu segmen diisi NaN.
+    # Urutan kolom sama dengan hasil pd.concat tiga DataFrame sebelumnya.
+    segment_sizes = (train_size, len(test_timestamps), len(future_timestamps))
+    n_historical = train_size + len(test_timestamps)
+    # Kolom aktual dirangkai sekali lalu dipakai ulang untuk status; tidak ada array gabungan kedua
+    pressure_actual = concat_segments((ground_truth_all[:train_size], actual_test_inv, None), segment_sizes)
+    # Kode status: 0 = Normal (di bawah threshold), 1 = Critical (termasuk NaN, sama seperti np.where(x < threshold)).
+    # Baris historis dinilai dari nilai aktual, baris forecast dari prediksi; ditulis langsung ke satu array int8.
+    # Threshold dibandingkan dalam float32 seperti datanya, agar bacaan tepat di threshold (0.13 vs 0.13) tetap Critical
+    status_codes = np.empty(len(pressure_actual), dtype=np.int8)
+    threshold_f32 = np.float32(threshold)
+    np.logical_not(pressure_actual[:n_historical] < threshold_f32, out=status_codes[:n_historical], casting='unsafe')
+    np.logical_not(np.asarray(future_predictions_inv, dtype=np.float32) < threshold_f32, out=status_codes[n_historical:], casting='unsafe')
+    export_df_combined = pd.DataFrame({
+        # Format timestamp for export (massal per offset zona, bukan strftime per baris)
+        'Timestamp': format_local_timestamps(timestamps_all[:train_size].append([test_timestamps, future_timestamps])),
+        'Pressure_Actual': pressure_actual,
+        'Pressure_Predicted_On_Historical': concat_segments((None, None, None), segment_sizes), # Tidak ada prediksi untuk ini di sini
+        # Type/Status sebagai Categorical (kode int8 + kategori), bukan satu objek str per baris
+        'Type': pd.Categorical.from_codes(
+            np.repeat(np.arange(3, dtype=np.int8), segment_sizes), categories=EXPORT_TYPE_CATEGORIES
+        ),
+        'Status': pd.Categorical.from_codes(status_codes, categories=EXPORT_STATUS_CATEGORIES),
+        'Pressure_Predicted_On_Test': concat_segments((None, predictions_on_test_inv, None), segment_sizes),
+        'Absolute_Error_Test': concat_segments((None, abs_error_test, None), segment_sizes),
+        'Pressure_Predicted_Future': concat_segments((None, None, future_predictions_inv), segment_sizes),
+        'Absolute_Error_Future': concat_segments((None, None, None), segment_sizes),
+    }, copy=False)
+    
+    # Writer CSV PyArrow menulis langsung ke buffer bytes (tanpa string Python perantara)
+    csv_buffer = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pandas(export_df_combined, preserve_index=False), csv_buffer)
+    return csv_buffer.getvalue()
+
+def shift_table_page(delta, total_pages):
+    """Callback tombol Previous/Next tabel detail: geser `page_num` sebelum script dijalankan ulang."""
+    st.session_state.page_num = min(max(st.session_state.page_num + delta, 0), total_pages - 1)
+
+# =============================================================================
+# 📊 INDUSTRIAL DASHBOARD MAIN SYSTEM
+# =============================================================================
+
+# Styling dashboard dan header utama (konstanta modul: string dibangun sekali saat import, bukan per rerun).
+# Tetap di-emit setiap rerun karena Streamlit menghapus elemen yang tidak ditulis ulang pada rerun.
+DASHBOARD_CSS = """
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
         
-        :root {{
+        :root {
             --main-header-start: #1e3c72; /* Dark blue for light theme */
             --main-header-end: #2a5298;   /* Lighter blue for light theme */
             
@@ -481,9 +1255,9 @@ def main_dashboard():
             
             --alert-normal-start: #c3e6cb; /* Light green for light theme */
             --alert-normal-end: #28a745;   /* Darker green for light theme */
-        }}
+        }
 
-        [data-baseweb="theme-provider"][theme-mode="dark"] {{
+        [data-baseweb="theme-provider"][theme-mode="dark"] {
             --main-header-start: #0f1c3a; /* Even darker blue for dark theme */
             --main-header-end: #1a2a4d;   /* Darker blue for dark theme */
 
@@ -495,110 +1269,165 @@ def main_dashboard():
 
             --alert-normal-start: #004d00; /* Darker green for dark theme */
             --alert-normal-end: #006b00;   /* Even darker green for dark theme */
-        }}
+        }
 
-        .main {{
+        .main {
             background-color: var(--background-color); /* Streamlit's default background */
             font-family: 'Inter', sans-serif;
-        }}
+        }
         
-        .main-header {{
+        .main-header {
             background: linear-gradient(90deg, var(--main-header-start) 0%, var(--main-header-end) 100%);
             padding: 20px;
             border-radius: 10px;
             margin-bottom: 30px;
             color: white;
             text-align: center;
-        }}
+        }
         
-        .kpi-container {{
+        .kpi-container {
             background: var(--secondary-background-color); /* Streamlit's default secondary background */
             padding: 20px;
             border-radius: 10px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             margin-bottom: 20px;
             border-left: 4px solid var(--main-header-start); /* Use one of the header colors */
-        }}
+        }
         
-        .alert-critical {{
+        .alert-critical {
             background: linear-gradient(90deg, var(--alert-critical-start) 0%, var(--alert-critical-end) 100%);
             border-left: 4px solid var(--alert-critical-end);
             padding: 15px;
             border-radius: 8px;
             margin: 10px 0;
             color: white; /* Text color for dark alert */
-        }}
+        }
         
-        .alert-warning {{
+        .alert-warning {
             background: linear-gradient(90deg, var(--alert-warning-start) 0%, var(--alert-warning-end) 100%);
             border-left: 4px solid var(--alert-warning-end);
             padding: 15px;
             border-radius: 8px;
             margin: 10px 0;
             color: #333; /* Dark text for light alert */
-        }}
+        }
         
-        .alert-normal {{
+        .alert-normal {
             background: linear-gradient(90deg, var(--alert-normal-start) 0%, var(--alert-normal-end) 100%);
             border-left: 4px solid var(--alert-normal-end);
             padding: 15px;
             border-radius: 8px;
             margin: 10px 0;
             color: white; /* Text color for dark alert */
-        }}
+        }
         
-        .metric-card {{
+        .metric-card {
             background: var(--secondary-background-color);
             padding: 15px;
             border-radius: 8px;
             box-shadow: 0 2px 5px rgba(0,0,0,0.1);
             text-align: center;
-        }}
+        }
         
-        .status-operational {{
+        .status-operational {
             color: var(--alert-normal-end);
             font-weight: 600;
-        }}
+        }
         
-        .status-warning {{
+        .status-warning {
             color: var(--alert-warning-end);
             font-weight: 600;
-        }}
+        }
         
-        .status-critical {{
+        .status-critical {
             color: var(--alert-critical-end);
             font-weight: 600;
-        }}
+        }
         
-        .stPlotlyChart {{
+        .stPlotlyChart {
             background: var(--secondary-background-color);
             border-radius: 10px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             margin-bottom: 20px;
-        }}
+        }
     </style>
-    """, unsafe_allow_html=True)
-    
-    # Main header
-    st.markdown("""
+    """
+
+DASHBOARD_HEADER_HTML = """
     <div class="main-header">
         <h1 style="margin: 0; font-size: 2.2rem;">🏭 Industrial Gas Removal Monitoring System</h1>
         <p style="margin: 10px 0 0 0; font-size: 1.1rem; opacity: 0.9;">
             Predictive Maintenance & Real-time Process Monitoring
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+# Template laporan ringkasan (TXT): teks statis dibangun sekali saat import, per rerun hanya nilai dinamis
+# yang disisipkan lewat format_map.
+REPORT_TEMPLATE = """
+Industrial Gas Removal System - Analysis Report
+Generated: {generated}
+
+SYSTEM STATUS: {system_status}
+Current Pressure: {current_pressure:.4f}
+Critical Threshold: {threshold:.4f}
+
+MODEL PERFORMANCE (On Test Set):
+- R² Score: {r2:.4f}
+- Mean Absolute Error: {mae:.6f}
+- Mean Squared Error: {mse:.6f}
+- Accuracy (±{accuracy_tolerance}): {accuracy:.2f}%
+
+DATA SOURCE:
+- File: {source_file}
+- Last Updated: {last_updated}
+- Auto-Update: {auto_update}
+- Update Interval: {update_interval}
+
+MAINTENANCE RECOMMENDATION:
+{recommendation}
+                """
+
+# Rekomendasi maintenance per status sistem (WARNING bisa ditambah waktu breach yang diprediksi)
+MAINTENANCE_RECOMMENDATIONS = {
+    "CRITICAL": "Immediate maintenance required - System critical!",
+    "WARNING": "Schedule maintenance within 24 hours",
+    "OPERATIONAL": "No immediate maintenance required",
+}
+
+def main_dashboard():
+    """Professional Industrial Dashboard with Auto-Update"""
+    # Plotly di-import hanya saat dashboard dibuka (lazy), sama seperti TensorFlow,
+    # agar render pertama halaman login tidak menanggung biaya import plotly
+    import plotly.graph_objects as go
+    
+    # Initialize session state (Pastikan ini dipanggil setiap kali main_dashboard dijalankan)
+    init_session_state()
+    
+    # Notifikasi login sukses (flag di-set oleh login_page sebelum rerun), hanya sekali
+    if st.session_state.pop('just_logged_in', False):
+        st.toast("Authentication successful! System loaded.", icon="✅")
+    
+    # st.set_page_config() dihapus dari sini karena sudah ada di paling atas
+    
+    # Professional industrial styling (dengan variabel CSS untuk tema gelap/terang)
+    st.markdown(DASHBOARD_CSS, unsafe_allow_html=True)
+    
+    # Main header
+    st.markdown(DASHBOARD_HEADER_HTML, unsafe_allow_html=True)
     
     # User panel with auto-update controls
-    show_user_panel()
+    # Fingerprint file CSV: satu stat() per rerun untuk panel sidebar, tombol refresh, dan kunci cache
+    file_key = get_file_key(CSV_FILE_PATH)
+    show_user_panel(file_key)
     
     # Sidebar configuration
     st.sidebar.markdown("## ⚙️ System Configuration")
     
-    # Model loading
-    MODEL_PATH = "best_lstm_model.h5"
+    # Model loading (dibangun sekali per proses; inferensinya sendiri di-cache di predict_sensor_data)
     try:
-        model = load_model(MODEL_PATH, compile=False)
+        get_lstm_predictor(MODEL_PATH)
+        get_lstm_forecaster(MODEL_PATH)
         st.sidebar.success("✅ LSTM Model Loaded")
     except Exception as e:
         st.sidebar.error(f"❌ Model Loading Failed: {str(e)}")
@@ -634,12 +1463,16 @@ def main_dashboard():
         step=0.01,
         help="Critical pressure threshold for maintenance alerts"
     )
+    # Threshold float32 (dtype data tekanan) untuk semua perbandingan: di NumPy 1.x float32 vs float Python
+    # dibandingkan dalam float64, sehingga bacaan tepat di threshold (0.14 vs 0.14) terbaca di atasnya.
+    # Sama dengan build_export_csv, jadi alert, waktu breach, tabel, dan Status export selalu sepakat
+    threshold_f32 = np.float32(threshold)
     
     sequence_length = st.sidebar.slider(
         "Prediction Sequence Length", 
         min_value=20, 
         max_value=120, 
-        value=80, 
+        value=DEFAULT_SEQUENCE_LENGTH, 
         step=10,
         help="Number of historical points used for prediction"
     )
@@ -647,108 +1480,53 @@ def main_dashboard():
     show_detailed_table = st.sidebar.checkbox("Show Detailed Data Table", value=False)
     
     # Load CSV using the cached function
-    df = load_csv_automatically(CSV_FILE_PATH)
+    st.session_state.last_file_modified = file_key
+    try:
+        prepared = prepare_sensor_data(CSV_FILE_PATH, file_key)
+    except Exception as e:
+        # Tidak ter-cache (lihat load_csv_automatically): Refresh Now / rerun berikutnya membaca ulang file
+        st.sidebar.error(f"❌ Error loading CSV: {str(e)}")
+        prepared = None
     
-    if df is not None:
+    if prepared is not None:
+        timestamps_all, ground_truth_all, scaled_data_all, scaling = prepared
+        
         # Data processing
         with st.spinner("🔄 Processing sensor data..."):
-            # Identify columns
-            timestamp_cols = [c for c in df.columns if any(keyword in c.lower() 
-                             for keyword in ['time', 'date', 'timestamp', 'waktu', 'tanggal'])]
-            
-            pressure_cols = [c for c in df.columns if any(keyword in c.lower() 
-                            for keyword in ['tekanan', 'pressure', 'kondensor', 'condenser'])]
-            
-            if not pressure_cols:
-                st.error("❌ Pressure column not found. Please ensure your data contains pressure measurements.")
-                st.stop()
-            
-            pressure_col = pressure_cols[0]
-            
-            # Process timestamps
-            if timestamp_cols:
-                timestamp_col = timestamp_cols[0]
-                date_formats = [
-                    '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S',
-                    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M',
-                    '%d-%m-%Y %H:%M', '%m/%d/%Y %H:%M',
-                    '%d/%m/%Y', '%Y-%m-%d' # Tambahkan format tanggal saja jika ada
-                ]
-                
-                parsed_dates = None
-                for date_format in date_formats:
-                    try:
-                        # Attempt to parse as naive datetime first
-                        temp_dates = pd.to_datetime(df[timestamp_col], format=date_format)
-                        if not temp_dates.isna().all():
-                            # Localize to Indonesia timezone if successfully parsed
-                            parsed_dates = temp_dates.dt.tz_localize(INDONESIA_TIMEZONE, errors='coerce')
-                            break
-                    except Exception:
-                        continue
-                
-                if parsed_dates is None or parsed_dates.isna().all():
-                    try:
-                        # Fallback if parsing with explicit format fails, try inferring
-                        temp_dates = pd.to_datetime(df[timestamp_col], errors='coerce')
-                        if temp_dates.isna().all():
-                            raise ValueError("All dates failed to parse")
-                        # Localize inferred dates
-                        parsed_dates = temp_dates.dt.tz_localize(INDONESIA_TIMEZONE, errors='coerce')
-                    except Exception:
-                        st.sidebar.warning("⚠️ Could not parse timestamp column. Generating timestamps and localizing.")
-                        # Asumsi interval data per jam jika tidak ada timestamp, dan lokal ke Asia/Jakarta
-                        parsed_dates = pd.date_range(start=get_current_localized_time() - timedelta(hours=len(df)-1), periods=len(df), freq='H', tz=INDONESIA_TIMEZONE)
-                
-                df['timestamp'] = parsed_dates
-            else:
-                df['timestamp'] = pd.date_range(start=get_current_localized_time() - timedelta(hours=len(df)-1), periods=len(df), freq='H', tz=INDONESIA_TIMEZONE)
-                st.sidebar.warning("⚠️ No timestamp column found. Using generated localized timestamps.")
-            
-           # Clean and prepare data
-            data = df[[pressure_col]].copy()
-            data = data.apply(lambda x: pd.to_numeric(x.astype(str).str.replace(',', '.'), errors='coerce'))
-            data = data.dropna()
-            
-            # Remove negative values
-            if (data < 0).any().any():
-                st.sidebar.warning("⚠️ Negative values detected and clipped to zero.")
-                data = data.clip(lower=0)
-            
-            ground_truth_all = data.values.flatten()
-            timestamps_all = df['timestamp'].iloc[:len(ground_truth_all)].tolist()
-            
-            # Scaling - Pindahkan ini ke atas, sebelum digunakan
-            scaler = MinMaxScaler(feature_range=(0, 1))
-            scaled_data_all = scaler.fit_transform(data)
-            
             # === START: Perubahan untuk pemisahan data training/testing dan evaluasi ===
             # Split data into training and testing sets (e.g., 80% train, 20% test)
             train_size = int(len(scaled_data_all) * 0.8) # scaled_data_all sudah terdefinisi di sini
             
-            train_data = scaled_data_all[:train_size]
             test_data = scaled_data_all[train_size:] # Data yang belum pernah dilihat model untuk evaluasi
             
-            # Create sequences for training and testing
-            def create_sequences(data, seq_length):
-                sequences = []
-                targets = []
-                for i in range(len(data) - seq_length): # -seq_length karena kita memprediksi 1 langkah ke depan dari sequence_length
-                    sequences.append(data[i:i+seq_length])
-                    targets.append(data[i+seq_length]) # Target adalah nilai setelah sequence
-                return np.array(sequences), np.array(targets)
-
-            X_train, y_train = create_sequences(train_data, sequence_length)
-            X_test, y_test = create_sequences(test_data, sequence_length) # Gunakan data tes
+            # Tentukan berapa banyak langkah ke depan (1 bulan)
+            # Asumsi data hourly: 30 hari * 24 jam = 720 langkah
+            future_steps_1_month = FORECAST_STEPS
+            
+            # Prediksi model pada seluruh data historis (window X_all_viz) untuk visualisasi, plus forecast 1 bulan.
+            # Hanya bergantung pada file CSV dan sequence_length, jadi di-cache: slider threshold tidak menjalankan model.
+            predictions_on_all_viz, future_predictions = predict_sensor_data(
+                MODEL_PATH, file_key, sequence_length, future_steps_1_month, scaled_data_all
+            )
+            
+            # Window test adalah window X_all_viz_data mulai indeks train_size
+            # (window test ke-i == X_all_viz_data[train_size + i]), jadi satu inferensi atas
+            # X_all_viz_data sudah mencakup prediksi test tanpa menghitung ulang window yang sama
+            n_test = max(len(test_data) - sequence_length, 0)
+            if n_test > 0:
+                predictions_on_test = predictions_on_all_viz[train_size:train_size + n_test]
 
+            # Akurasi (sesuai definisi Anda: dalam +/- 0.01 dari nilai aktual)
+            accuracy_tolerance = 0.01
+            
             # Lakukan prediksi pada data tes
-            if len(X_test) > 0:
-                predictions_on_test = model.predict(X_test)
-                predictions_on_test_inv = scaler.inverse_transform(predictions_on_test).flatten()
-                actual_test_inv = scaler.inverse_transform(y_test).flatten()
+            if n_test > 0:
+                predictions_on_test_inv = inverse_scale(scaling, predictions_on_test)
+                # Target test = data setelah train_size + sequence_length; nilai aslinya sudah ada di ground_truth_all
+                actual_test_inv = ground_truth_all[train_size + sequence_length:]
                 
                 # Timestamps untuk data tes yang diprediksi
-                # Ini adalah timestamps untuk y_test
+                # Ini adalah timestamps untuk target test
                 test_timestamps = timestamps_all[train_size + sequence_length:]
                 
                 # Pastikan panjangnya sama
@@ -759,16 +1537,27 @@ def main_dashboard():
                     test_timestamps = test_timestamps[:min_len_test]
 
                 # Calculate metrics on the TEST SET
-                mse = mean_squared_error(actual_test_inv, predictions_on_test_inv)
-                mae = mean_absolute_error(actual_test_inv, predictions_on_test_inv)
-                r2 = r2_score(actual_test_inv, predictions_on_test_inv)
+                # Satu array selisih dipakai untuk MSE, MAE, R², akurasi, histogram error, dan export
+                # Agregat dihitung dalam float64 agar jumlah kuadrat (ss_res/ss_tot) tidak kehilangan presisi
+                actual_test_f64 = actual_test_inv.astype(np.float64)
+                diff_test = actual_test_f64 - predictions_on_test_inv
+                ss_res = float(diff_test @ diff_test)
+                mse = ss_res / len(diff_test)
+                # Buffer selisih dan salinan float64 dipakai ulang in-place (tanpa alokasi array baru)
+                abs_error_test = np.abs(diff_test, out=diff_test)
+                mae = float(abs_error_test.mean())
+                centered = actual_test_f64
+                centered -= centered.mean()
+                ss_tot = float(centered @ centered)
+                # Sama seperti sklearn r2_score: data aktual konstan -> 1.0 jika prediksi sempurna, selain itu 0.0
+                r2 = 1 - ss_res / ss_tot if ss_tot > 0 else (1.0 if ss_res == 0 else 0.0)
                 
-                # Akurasi (sesuai definisi Anda: dalam +/- 0.01 dari nilai aktual)
-                accuracy_tolerance = 0.01
-                accuracy = np.mean(np.abs(actual_test_inv - predictions_on_test_inv) <= accuracy_tolerance) * 100
+                accuracy = np.mean(abs_error_test <= accuracy_tolerance) * 100
                 
             else:
                 mse, mae, r2, accuracy = 0, 0, 0, 0
+                actual_test_inv = predictions_on_test_inv = abs_error_test = np.array([])
+                test_timestamps = timestamps_all[:0] # Kosong, tetap bertipe datetime untuk export
                 st.warning("Insufficient data for testing. Metrics set to 0. Please ensure enough data for training and testing after splitting.")
             
             # Untuk visualisasi historis, gunakan semua data
@@ -781,20 +1570,14 @@ def main_dashboard():
             # Saya akan mempertahankan 'predictions_on_historical_inv' Anda yang lama untuk visualisasi,
             # tetapi akurasi dihitung dari data test.
             
-            # Jika Anda ingin menunjukkan prediksi model pada seluruh data historis untuk visualisasi,
-            # Anda perlu membuat X_all_viz dan melakukan prediksi pada itu.
-            # Ubah pemanggilan create_sequences agar sesuai dengan definisi baru (dengan target)
-            X_all_viz_data, y_all_viz_data = create_sequences(scaled_data_all, sequence_length)
-            
-            if len(X_all_viz_data) > 0: # Menggunakan X_all_viz_data
-                predictions_on_all_viz = model.predict(X_all_viz_data) # Menggunakan X_all_viz_data
-                predictions_on_all_viz_inv = scaler.inverse_transform(predictions_on_all_viz).flatten()
+            if len(predictions_on_all_viz) > 0: # Prediksi atas window X_all_viz_data
+                predictions_on_all_viz_inv = inverse_scale(scaling, predictions_on_all_viz)
                 # Timestamps untuk prediksi pada semua data (dimulai dari sequence_length)
                 timestamps_for_all_predictions_viz = timestamps_all[sequence_length:]
-                actual_for_all_predictions_viz = scaler.inverse_transform(y_all_viz_data).flatten() # Menggunakan y_all_viz_data
+                actual_for_all_predictions_viz = ground_truth_all[sequence_length:] # Nilai asli dari target tiap window
             else:
                 predictions_on_all_viz_inv = []
-                timestamps_for_all_predictions_viz = []
+                timestamps_for_all_predictions_viz = timestamps_all[:0]
                 actual_for_all_predictions_viz = []
 
             # === END: Perubahan untuk pemisahan data training/testing dan evaluasi ===
@@ -803,46 +1586,13 @@ def main_dashboard():
             # 🔮 PREDIKSI 1 BULAN KE DEPAN
             # =============================================================================
             
-            def predict_future(model, last_sequence, scaler, sequence_length, future_steps, freq='H', timezone=None):
-                """
-                Memprediksi nilai masa depan menggunakan model LSTM.
-                `last_sequence`: Sequence terakhir dari data historis yang diskalakan.
-                `future_steps`: Jumlah langkah ke depan yang akan diprediksi (misal: 30 hari * 24 jam = 720 langkah untuk bulanan).
-                `freq`: Frekuensi data (misal: 'H' untuk jam, 'D' untuk hari).
-                `timezone`: Timezone untuk timestamp yang akan dibuat.
-                """
-                predicted_values = []
-                current_sequence = last_sequence.copy()
-                
-                for _ in range(future_steps):
-                    # Reshape untuk input model: (1, seq_length, 1)
-                    input_seq = current_sequence.reshape(1, sequence_length, 1)
-                    
-                    # Prediksi satu langkah ke depan
-                    next_pred_scaled = model.predict(input_seq, verbose=0)[0]
-                    predicted_values.append(next_pred_scaled[0]) # Ambil nilai prediksi (karena output juga 1)
-                    
-                    # Geser sequence: hapus elemen pertama, tambahkan prediksi baru
-                    current_sequence = np.append(current_sequence[1:], next_pred_scaled[0])
-                
-                # Inverse transform untuk mendapatkan nilai sebenarnya
-                predicted_values_inv = scaler.inverse_transform(np.array(predicted_values).reshape(-1, 1)).flatten()
-                return predicted_values_inv
-
-            # Tentukan berapa banyak langkah ke depan (1 bulan)
-            # Asumsi data hourly: 30 hari * 24 jam = 720 langkah
-            future_steps_1_month = 30 * 24 
-            
-            # Dapatkan sequence terakhir dari data historis yang diskalakan
-            last_sequence = scaled_data_all[-sequence_length:]
-            
-            # Prediksi masa depan
-            future_predictions_inv = predict_future(model, last_sequence, scaler, sequence_length, future_steps_1_month, timezone=INDONESIA_TIMEZONE)
+            # Forecast autoregresif (dari cache predict_sensor_data); inverse transform untuk mendapatkan nilai sebenarnya
+            future_predictions_inv = inverse_scale(scaling, future_predictions)
             
             # Buat timestamps untuk prediksi masa depan, pastikan berzona waktu
             last_timestamp = timestamps_all[-1]
             future_timestamps = pd.date_range(start=last_timestamp + timedelta(hours=1), 
-                                              periods=future_steps_1_month, freq='H', tz=INDONESIA_TIMEZONE).tolist()
+                                              periods=future_steps_1_month, freq='H', tz=INDONESIA_TIMEZONE)
             
             # =============================================================================
             # 🚨 SYSTEM STATUS & PREDICTIVE ALERTING
@@ -854,26 +1604,23 @@ def main_dashboard():
             # Prediksi ini dari test set
             predicted_pressure_now = predictions_on_test_inv[-1] if len(predictions_on_test_inv) > 0 else 0
             
-            system_status = "OPERATIONAL"
-            status_color = "status-operational"
-            alert_class = "alert-normal"
-            
+            # Cek apakah prediksi masa depan akan menyentuh threshold: argmax pada mask boolean
+            # memberi indeks True pertama; dicek ulang karena argmax mengembalikan 0 jika tidak ada yang True
             predicted_breach_time = None
-
-            # Cek apakah prediksi masa depan akan menyentuh threshold
-            for i, val in enumerate(future_predictions_inv):
-                if val >= threshold:
-                    predicted_breach_time = future_timestamps[i]
-                    break
+            breach_mask = future_predictions_inv >= threshold_f32
+            breach_idx = int(np.argmax(breach_mask)) if len(breach_mask) > 0 else 0
+            if len(breach_mask) > 0 and breach_mask[breach_idx]:
+                predicted_breach_time = future_timestamps[breach_idx]
+            # Teks waktu breach diformat sekali, dipakai di alert status dan laporan ringkasan
+            predicted_breach_text = predicted_breach_time.strftime('%Y-%m-%d %H:%M %Z%z') if predicted_breach_time else ""
             
-            if current_pressure > threshold or predicted_pressure_now > threshold:
-                system_status = "CRITICAL"
-                status_color = "status-critical"
-                alert_class = "alert-critical"
-            elif current_pressure > threshold * 0.8 or predicted_pressure_now > threshold * 0.8 or predicted_breach_time:
-                system_status = "WARNING"
-                status_color = "status-warning"
-                alert_class = "alert-warning"
+            # Satu perbandingan terhadap tekanan terburuk (aktual vs prediksi), lalu lookup tabel status
+            worst_pressure = max(current_pressure, predicted_pressure_now)
+            if worst_pressure > threshold_f32:
+                status_level = 2
+            else:
+                status_level = int(worst_pressure > np.float32(threshold * WARNING_THRESHOLD_RATIO) or predicted_breach_time is not None)
+            system_status, status_color, alert_class = SYSTEM_STATUS_LEVELS[status_level]
 
             # =============================================================================
             # 📊 MAIN DASHBOARD DISPLAY
@@ -894,7 +1641,7 @@ def main_dashboard():
                 breach_message = ""
                 if predicted_breach_time:
                     # Ensure breach time is formatted with timezone info
-                    breach_message = f"<br><strong>Predicted to reach threshold by: {predicted_breach_time.strftime('%Y-%m-%d %H:%M %Z%z')}</strong>"
+                    breach_message = f"<br><strong>Predicted to reach threshold by: {predicted_breach_text}</strong>"
                 st.markdown(f"""
                 <div class="{alert_class}">
                     <h3>⚠️ WARNING</h3>
@@ -927,7 +1674,7 @@ def main_dashboard():
                 st.metric(
                     "Current Pressure", 
                     f"{current_pressure:.4f}",
-                    delta=f"{(current_pressure - threshold):.4f}" if current_pressure > threshold else "0.0000"
+                    delta=f"{(current_pressure - threshold):.4f}" if current_pressure > threshold_f32 else "0.0000"
                 )
             
             with col3:
@@ -956,42 +1703,49 @@ def main_dashboard():
             st.markdown("### 📈 Process Monitoring & Prediction (Including 1-Month Forecast)")
             
             # Create single comprehensive chart
-            fig = go.Figure()
-            
-            # Historical Data (All available data)
-            fig.add_trace(
-                go.Scatter(
-                    x=timestamps_for_chart, 
-                    y=ground_truth_for_chart,
-                    mode='lines',
-                    name='Historical Data',
-                    line=dict(color='#2E86AB', width=2),
-                    fill='tonexty',
-                    fillcolor='rgba(46, 134, 171, 0.1)'
+            # Trace panjang di-downsample (LTTB) agar payload JSON ke browser tetap kecil,
+            # dan digambar dengan Scattergl (WebGL) alih-alih SVG agar render/zoom/hover tetap ringan
+            (chart_x, chart_y), (viz_x, viz_y), (future_x, future_y) = downsample_chart_traces(
+                file_key, sequence_length, (
+                    (timestamps_for_chart, ground_truth_for_chart),
+                    (timestamps_for_all_predictions_viz, predictions_on_all_viz_inv),
+                    (future_timestamps, future_predictions_inv)
                 )
             )
             
-            # Predicted values on historical data (overlay on the last part of historical)
-            # Ini adalah prediksi pada seluruh data untuk visualisasi, bukan untuk metrik.
-            fig.add_trace(
-                go.Scatter(
-                    x=timestamps_for_all_predictions_viz, 
-                    y=predictions_on_all_viz_inv,
-                    mode='lines',
-                    name='Model Prediction (Historical Viz)',
-                    line=dict(color='#A23B72', width=2, dash='dash')
-                )
-            )
-
-            # Future Predictions (1 Month)
-            fig.add_trace(
-                go.Scatter(
-                    x=future_timestamps,
-                    y=future_predictions_inv,
-                    mode='lines',
-                    name=f'Future Prediction ({future_steps_1_month} steps)',
-                    line=dict(color='#00CC96', width=3, dash='dot') # Warna baru untuk prediksi masa depan
-                )
+            # Figure dibangun sekali dengan data + layout statis (MAIN_CHART_LAYOUT), bukan add_trace/update_layout
+            # bertahap yang memvalidasi ulang figure di tiap langkah
+            fig = go.Figure(
+                data=[
+                    # Historical Data (All available data)
+                    go.Scattergl(
+                        x=chart_x, 
+                        y=chart_y,
+                        mode='lines',
+                        name='Historical Data',
+                        line=dict(color='#2E86AB', width=2),
+                        fill='tonexty',
+                        fillcolor='rgba(46, 134, 171, 0.1)'
+                    ),
+                    # Predicted values on historical data (overlay on the last part of historical)
+                    # Ini adalah prediksi pada seluruh data untuk visualisasi, bukan untuk metrik.
+                    go.Scattergl(
+                        x=viz_x, 
+                        y=viz_y,
+                        mode='lines',
+                        name='Model Prediction (Historical Viz)',
+                        line=dict(color='#A23B72', width=2, dash='dash')
+                    ),
+                    # Future Predictions (1 Month)
+                    go.Scattergl(
+                        x=future_x,
+                        y=future_y,
+                        mode='lines',
+                        name=f'Future Prediction ({future_steps_1_month} steps)',
+                        line=dict(color='#00CC96', width=3, dash='dot') # Warna baru untuk prediksi masa depan
+                    )
+                ],
+                layout=MAIN_CHART_LAYOUT
             )
             
             # Threshold line
@@ -1002,27 +1756,9 @@ def main_dashboard():
                 annotation_text=f"Critical Threshold ({threshold})"
             )
             
-            # Update layout
-            fig.update_layout(
-                height=600,
-                showlegend=True,
-                title="Industrial Gas Removal System - Process Monitoring & Prediction",
-                title_x=0.5,
-                title_font_size=20,
-                template="plotly_white",
-                xaxis_title="Time",
-                yaxis_title="Pressure",
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                ),
-                xaxis=dict(tickformat="%Y-%m-%d %H:%M:%S") # Ensure x-axis shows full timestamp
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            # Key tetap: Streamlit memperlakukan chart sebagai elemen yang sama antar rerun (auto-update)
+            # dan hanya mengganti spec-nya, bukan membongkar dan memasang ulang komponen Plotly
+            st.plotly_chart(fig, use_container_width=True, key="main_chart")
             
             # Performance metrics
             st.markdown("### 📊 Model Performance Analysis")
@@ -1031,35 +1767,13 @@ def main_dashboard():
             
             with col1:
                 # Performance metrics table
-                metrics_df = pd.DataFrame({
-                    'Metric': ['Mean Squared Error (Test)', 'Mean Absolute Error (Test)', 'R² Score (Test)', f'Accuracy (±{accuracy_tolerance}) (Test)'],
-                    'Value': [f"{mse:.6f}", f"{mae:.6f}", f"{r2:.4f}", 
-                              f"{accuracy:.2f}%"],
-                    'Status': ['Good' if mse < 0.001 else 'Acceptable' if mse < 0.01 else 'Poor',
-                              'Good' if mae < 0.01 else 'Acceptable' if mae < 0.05 else 'Poor',
-                              'Excellent' if r2 > 0.9 else 'Good' if r2 > 0.8 else 'Acceptable',
-                              'Excellent' if accuracy > 90 else 'Good'] 
-                })
+                metrics_df = build_metrics_table(mse, mae, r2, accuracy, accuracy_tolerance)
                 st.dataframe(metrics_df, use_container_width=True)
             
             with col2:
                 # Prediction distribution
                 if len(actual_test_inv) > 0:
-                    error = np.abs(actual_test_inv - predictions_on_test_inv)
-                    fig_dist = go.Figure()
-                    fig_dist.add_trace(go.Histogram(
-                        x=error,
-                        nbinsx=20,
-                        name='Error Distribution',
-                        marker_color='rgba(46, 134, 171, 0.7)'
-                    ))
-                    fig_dist.update_layout(
-                        title="Prediction Error Distribution (Test Set)",
-                        xaxis_title="Absolute Error",
-                        yaxis_title="Frequency",
-                        template="plotly_white",
-                        height=300
-                    )
+                    fig_dist = build_error_histogram(file_key, sequence_length, abs_error_test)
                     st.plotly_chart(fig_dist, use_container_width=True)
                 else:
                     st.warning("Not enough data to show error distribution on test set.")
@@ -1068,133 +1782,112 @@ def main_dashboard():
             if show_detailed_table:
                 st.markdown("### 📋 Detailed Process Data")
                 
-                # Combine historical and future data for the table
-                full_timestamps = timestamps_all + future_timestamps
-                full_pressures = ground_truth_all.tolist() + future_predictions_inv.tolist()
-
-                detailed_df = pd.DataFrame({
-                    'Timestamp': full_timestamps,
-                    'Pressure': full_pressures,
-                    'Type': ['Historical'] * len(ground_truth_all) + ['Predicted'] * len(future_predictions_inv),
-                    'Status': ['Normal' if p < threshold else 'Critical' for p in full_pressures]
-                })
-                
-                # Format timestamp for display in the table
-                detailed_df['Timestamp'] = detailed_df['Timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S %Z%z')
+                # Historical + future dianggap satu tabel virtual; hanya baris halaman aktif yang dibangun
+                n_historical = len(ground_truth_all)
+                total_rows = n_historical + len(future_predictions_inv)
 
                 # Pagination
                 if "page_num" not in st.session_state:
                     st.session_state.page_num = 0
                 
                 rows_per_page = 20
-                total_pages = (len(detailed_df) - 1) // rows_per_page + 1
+                total_pages = max((total_rows - 1) // rows_per_page + 1, 1)
+                st.session_state.page_num = min(st.session_state.page_num, total_pages - 1)
                 
+                # Navigasi via on_click: halaman sudah bergeser saat rerun dari klik dimulai,
+                # jadi tidak perlu st.rerun() kedua yang menghitung ulang seluruh dashboard
                 col1_p, col2_p, col3_p = st.columns([1, 2, 1])
                 with col1_p:
-                    if st.button("← Previous") and st.session_state.page_num > 0:
-                        st.session_state.page_num -= 1
-                        st.rerun() # Rerun untuk update halaman tabel
+                    st.button("← Previous", on_click=shift_table_page, args=(-1, total_pages),
+                              disabled=st.session_state.page_num == 0)
                 
                 with col2_p:
                     st.write(f"Page {st.session_state.page_num + 1} of {total_pages}")
                 
                 with col3_p:
-                    if st.button("Next →") and st.session_state.page_num < total_pages - 1:
-                        st.session_state.page_num += 1
-                        st.rerun() # Rerun untuk update halaman tabel
+                    st.button("Next →", on_click=shift_table_page, args=(1, total_pages),
+                              disabled=st.session_state.page_num >= total_pages - 1)
                 
                 start_idx = st.session_state.page_num * rows_per_page
-                end_idx = start_idx + rows_per_page
+                end_idx = min(start_idx + rows_per_page, total_rows)
+                
+                # Slice masing-masing sumber; indeks future digeser sebanyak n_historical
+                future_start = max(start_idx - n_historical, 0)
+                future_end = max(end_idx - n_historical, 0)
+                page_pressures = np.concatenate([
+                    ground_truth_all[start_idx:end_idx],
+                    future_predictions_inv[future_start:future_end]
+                ])
+                
+                # Format timestamp for display in the table (DatetimeIndex.strftime, langsung sebelum DataFrame dibangun)
+                page_timestamps = timestamps_all[start_idx:end_idx].append(future_timestamps[future_start:future_end])
+                detailed_df = pd.DataFrame({
+                    'Timestamp': page_timestamps.strftime('%Y-%m-%d %H:%M:%S %Z%z'),
+                    'Pressure': page_pressures,
+                    'Type': np.where(np.arange(start_idx, end_idx) < n_historical, 'Historical', 'Predicted'),
+                    'Status': np.where(page_pressures < threshold_f32, 'Normal', 'Critical')
+                })
                 
                 st.dataframe(
-                    detailed_df.iloc[start_idx:end_idx],
+                    detailed_df,
                     use_container_width=True
                 )
             
             # Export functionality
             st.markdown("### 📤 Data Export")
             
+            # Satu waktu referensi untuk nama file dan isi laporan pada run ini
+            export_time = get_current_localized_time()
+            
             # Untuk export, kita bisa gabungkan hasil prediksi pada test set dengan prediksi masa depan
             # Atau, buat data frame baru yang lebih relevan untuk laporan.
             # Saya akan membuat export_df yang jelas memisahkan historical (aktual) dan prediksi test/future.
 
-            export_df_actual = pd.DataFrame({
-                'Timestamp': timestamps_all[:train_size], # Data training historis
-                'Pressure_Actual': ground_truth_all[:train_size],
-                'Pressure_Predicted_On_Historical': np.nan, # Tidak ada prediksi untuk ini di sini
-                'Type': 'Historical_Train',
-                'Status': ['Normal' if p < threshold else 'Critical' for p in ground_truth_all[:train_size]]
-            })
-
-            export_df_test_pred = pd.DataFrame({
-                'Timestamp': test_timestamps,
-                'Pressure_Actual': actual_test_inv,
-                'Pressure_Predicted_On_Test': predictions_on_test_inv,
-                'Absolute_Error_Test': np.abs(actual_test_inv - predictions_on_test_inv),
-                'Type': 'Historical_Test_Prediction',
-                'Status': ['Normal' if p < threshold else 'Critical' for p in actual_test_inv]
-            })
-
-            future_export_df = pd.DataFrame({
-                'Timestamp': future_timestamps,
-                'Pressure_Actual': np.nan, 
-                'Pressure_Predicted_Future': future_predictions_inv,
-                'Absolute_Error_Future': np.nan, 
-                'Type': 'Future_Prediction',
-                'Status': ['Normal' if p < threshold else 'Critical' for p in future_predictions_inv]
-            })
-
-            # Gabungkan semua DataFrame
-            export_df_combined = pd.concat([export_df_actual, export_df_test_pred, future_export_df], ignore_index=True)
-            
-            # Format timestamp columns for export
-            export_df_combined['Timestamp'] = export_df_combined['Timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S %Z%z')
+            # CSV export di-cache per versi file, sequence_length, dan threshold: rerun biasa
+            # (pagination, tick auto-update tanpa file baru) tidak men-serialisasi ulang seluruh data
+            csv_data = build_export_csv(
+                file_key, sequence_length, threshold,
+                (timestamps_all, ground_truth_all, train_size),
+                (test_timestamps, actual_test_inv, predictions_on_test_inv, abs_error_test),
+                (future_timestamps, future_predictions_inv)
+            )
 
             col_export_1, col_export_2 = st.columns(2)
             
             with col_export_1:
-                csv_data = export_df_combined.to_csv(index=False).encode('utf-8')
                 st.download_button(
                     label="📊 Download Analysis Report (CSV)",
                     data=csv_data,
-                    file_name=f"gas_removal_analysis_{get_current_localized_time().strftime('%Y%m%d_%H%M%S')}.csv",
+                    file_name=f"gas_removal_analysis_{export_time.strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
             
             with col_export_2:
-                # Generate summary report
-                report_text = f"""
-Industrial Gas Removal System - Analysis Report
-Generated: {get_current_localized_time().strftime('%Y-%m-%d %H:%M:%S %Z%z')}
-
-SYSTEM STATUS: {system_status}
-Current Pressure: {current_pressure:.4f}
-Critical Threshold: {threshold:.4f}
-
-MODEL PERFORMANCE (On Test Set):
-- R² Score: {r2:.4f}
-- Mean Absolute Error: {mae:.6f}
-- Mean Squared Error: {mse:.6f}
-- Accuracy (±{accuracy_tolerance}): {accuracy:.2f}%
-
-DATA SOURCE:
-- File: {CSV_FILE_NAME}
-- Last Updated: {st.session_state.last_update_time.strftime('%Y-%m-%d %H:%M:%S %Z%z')}
-- Auto-Update: {'Enabled' if st.session_state.auto_update_enabled else 'Disabled'}
-- Update Interval: {st.session_state.get('selected_interval_label', '3 hours')}
-
-MAINTENANCE RECOMMENDATION:
-{
-"Immediate maintenance required - System critical!" if system_status == "CRITICAL" else
-"Schedule maintenance within 24 hours" + (f" (Predicted breach by: {predicted_breach_time.strftime('%Y-%m-%d %H:%M %Z%z')})" if predicted_breach_time else "") if system_status == "WARNING" else
-"No immediate maintenance required"
-}
-                """
+                # Generate summary report (template modul; hanya nilai dinamis yang diformat)
+                recommendation = MAINTENANCE_RECOMMENDATIONS[system_status]
+                if system_status == "WARNING" and predicted_breach_time:
+                    recommendation += f" (Predicted breach by: {predicted_breach_text})"
+                report_text = REPORT_TEMPLATE.format_map({
+                    'generated': export_time.strftime('%Y-%m-%d %H:%M:%S %Z%z'),
+                    'system_status': system_status,
+                    'current_pressure': current_pressure,
+                    'threshold': threshold,
+                    'r2': r2,
+                    'mae': mae,
+                    'mse': mse,
+                    'accuracy_tolerance': accuracy_tolerance,
+                    'accuracy': accuracy,
+                    'source_file': CSV_FILE_NAME,
+                    'last_updated': st.session_state.last_update_time.strftime('%Y-%m-%d %H:%M:%S %Z%z'),
+                    'auto_update': 'Enabled' if st.session_state.auto_update_enabled else 'Disabled',
+                    'update_interval': st.session_state.get('selected_interval_label', '3 hours'),
+                    'recommendation': recommendation,
+                })
                 
                 st.download_button(
                     label="📄 Download Summary Report (TXT)",
                     data=report_text,
-                    file_name=f"gas_removal_summary_report_{get_current_localized_time().strftime('%Y%m%d_%H%M%S')}.txt",
+                    file_name=f"gas_removal_summary_report_{export_time.strftime('%Y%m%d_%H%M%S')}.txt",
                     mime="text/plain"
                 )
 